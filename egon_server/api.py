@@ -1,9 +1,16 @@
 """URL routing for the application's REST API."""
 
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi_restful import Api
 
 from . import resources
+from .compression import CompressionMiddleware
+from .history import apply_retention
+from .jobs import PeriodicJob
+from .settings import SETTINGS
+from .summary import StatusSummary
 
 
 class AppFactory:
@@ -19,11 +26,18 @@ class AppFactory:
         """
 
         app = FastAPI(*args, import_name=import_name, openapi_url=openapi_url, **kwargs)
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=SETTINGS.compression_minimum_size,
+            cache_size=SETTINGS.compression_cache_size)
+
         api = Api(app)
 
         api.add_resource(resources.common.Description(), '/')
         api.add_resource(resources.common.Health(), '/health')
-        cls.add_v1_endpoints(api, endpoint_root='/v1')
+        summary = StatusSummary(SETTINGS.summary_recent_window, SETTINGS.summary_stale_after)
+        cls.add_v1_endpoints(api, endpoint_root='/v1', summary=summary)
+        cls.add_background_jobs(app, summary)
         return app
 
     @staticmethod
@@ -33,10 +47,41 @@ class AppFactory:
         return '/' + f'{endpoint_root}'.strip('/')
 
     @classmethod
-    def add_v1_endpoints(cls, api: Api, endpoint_root: str = '') -> None:
-        """Add endpoints for version 1 of the API specification"""
+    def add_v1_endpoints(cls, api: Api, endpoint_root: str = '', summary: Optional[StatusSummary] = None) -> None:
+        """Add endpoints for version 1 of the API specification
+
+        Args:
+            api: The API to add endpoints to
+            endpoint_root: The URL path prefix for all endpoints
+            summary: The status summary served by the summary endpoint
+        """
 
         endpoint_root = cls._clean_endpoint_root(endpoint_root)
         api.add_resource(resources.common.Version(1), f'{endpoint_root}/version')
         api.add_resource(resources.v1.Pipeline(), endpoint_root + '/pipeline/{pipelineId}')
         api.add_resource(resources.v1.Node(), endpoint_root + '/node/{nodeId}/')
+        api.add_resource(resources.v1.Pipelines(), f'{endpoint_root}/pipelines')
+        api.add_resource(resources.v1.Nodes(), f'{endpoint_root}/nodes')
+        api.add_resource(resources.v1.Search(), f'{endpoint_root}/search')
+        api.add_resource(resources.v1.Autocomplete(), f'{endpoint_root}/autocomplete')
+        api.add_resource(resources.v1.StatusHistory(), f'{endpoint_root}/history')
+        api.add_resource(resources.v1.StatusRollups(), endpoint_root + '/history/{objectType}/{egonId}')
+        if summary is not None:
+            api.add_resource(resources.v1.Summary(summary), f'{endpoint_root}/summary')
+
+    @staticmethod
+    def add_background_jobs(app: FastAPI, summary: StatusSummary) -> None:
+        """Register background jobs to run for the lifetime of the application
+
+        Args:
+            app: The application to register jobs with
+            summary: The status summary to keep refreshed
+        """
+
+        jobs = [PeriodicJob(summary.refresh, SETTINGS.summary_refresh_interval, run_immediately=True)]
+        if SETTINGS.history_retention_interval > 0:
+            jobs.append(PeriodicJob(apply_retention, SETTINGS.history_retention_interval))
+
+        for job in jobs:
+            app.add_event_handler('startup', job.start)
+            app.add_event_handler('shutdown', job.stop)
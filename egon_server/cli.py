@@ -8,13 +8,15 @@ The ``Application.execute`` method serves as the default application entrypoint
 when executing the parent package from the command line.
 """
 
+import asyncio
 import logging
 from argparse import ArgumentParser
+from typing import List
 
 import uvicorn
 from alembic import config, command
 
-from . import __version__
+from . import __version__, history, sharding
 from .api import AppFactory
 from .orm import __db_version__, DBConnection, MIGRATIONS_DIR
 from .settings import SETTINGS
@@ -35,6 +37,20 @@ class Parser(ArgumentParser):
         migrate = subparsers.add_parser('migrate', description='Migrate the database schema to the latest version.')
         migrate.set_defaults(callable=Application.migrate_db)
 
+        # Subparser for applying status history retention rules
+        retention = subparsers.add_parser(
+            'retention', description='Downsample and expire status history according to the retention settings.')
+        retention.set_defaults(callable=Application.apply_retention)
+
+        # Subparser for redistributing data after adding database shards
+        rebalance = subparsers.add_parser(
+            'rebalance',
+            description='Move data between database shards after adding new shards. API servers may keep running '
+                        'with the new list of shards; records they have already written are merged with moved records.')
+        rebalance.set_defaults(callable=Application.rebalance_shards)
+        rebalance.add_argument(
+            'previous_shards', nargs='+', help='database URIs of the shards in use before new shards were added')
+
         # Subparser for launching the API server
         serve = subparsers.add_parser('serve', description='Launch a new API server instance.')
         serve.set_defaults(callable=Application.serve_api)
@@ -69,20 +85,45 @@ class Application:
         """Migrate the application database to the given schema version
 
         Defaults to the schema version expected by the ORM module
-        (``orm.__db_version__``).
+        (``orm.__db_version__``). If the database is sharded, every shard
+        is migrated.
 
         Args:
             schema_version: The schema version to migrate to
         """
 
-        alembic_cfg = config.Config()
-        alembic_cfg.set_main_option('script_location', str(MIGRATIONS_DIR))
-        alembic_cfg.set_main_option('sqlalchemy.url', SETTINGS.get_db_uri())
+        for db_uri in SETTINGS.get_db_uris():
+            alembic_cfg = config.Config()
+            alembic_cfg.set_main_option('script_location', str(MIGRATIONS_DIR))
+            alembic_cfg.set_main_option('sqlalchemy.url', db_uri)
+
+            # Upgrade/downgrade commands are null operations if the destination
+            # version is below/above the current revision
+            command.upgrade(alembic_cfg, schema_version)
+            command.downgrade(alembic_cfg, schema_version)
+
+    @classmethod
+    def apply_retention(cls) -> None:
+        """Downsample and expire status history according to the application retention settings"""
+
+        DBConnection.configure(*SETTINGS.get_db_uris())
+        asyncio.run(history.apply_retention())
+
+    @classmethod
+    def rebalance_shards(cls, previous_shards: List[str]) -> None:
+        """Move data to the database shards that own it after new shards are added
+
+        New shards should be listed in the application settings and migrated
+        before running this command. Servers configured with the new shards
+        may keep running. Records they write to a new shard are merged with
+        the moved records (see the ``sharding`` module).
+
+        Args:
+            previous_shards: Database URIs of the shards in use before new shards were added
+        """
 
-        # Upgrade/downgrade commands are null operations if the destination
-        # version is below/above the current revision
-        command.upgrade(alembic_cfg, schema_version)
-        command.downgrade(alembic_cfg, schema_version)
+        moved = asyncio.run(sharding.rebalance(previous_shards, SETTINGS.get_db_uris()))
+        logging.getLogger('console_logger').info(f'Moved {moved} records between database shards')
 
     @classmethod
     def serve_api(
@@ -103,7 +144,7 @@ class Application:
             workers: Number of worker processes to spawn
         """
 
-        DBConnection.configure(url=SETTINGS.get_db_uri())
+        DBConnection.configure(*SETTINGS.get_db_uris())
         uvicorn.run(
             app='egon_server.cli:Application.app',
             host=host,
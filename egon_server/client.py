@@ -0,0 +1,244 @@
+"""An asynchronous Python client for the Egon Status API.
+
+The ``Client`` class wraps a persistent ``requests.Session`` whose keep-alive
+connection pool is shared by every call made through the client. Blocking
+HTTP calls are dispatched to a dedicated thread pool so the client can be
+awaited from inside an event loop without stalling other tasks. Failed
+requests are retried using exponential backoff with full jitter.
+
+When a ``batch_window`` is given, calls made within that window are
+collected and dispatched together. All pipeline lookups collected in a
+window are combined into a single request to the ``/pipelines`` endpoint,
+and all node lookups into a single request to ``/nodes``. Repeated lookups
+for the same object share one result. Objects missing from a batched
+response raise the same 404 ``requests.HTTPError`` as a single lookup.
+"""
+
+import asyncio
+import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional, Set, Tuple, Union
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+SINGLE_PATHS = {'pipeline': '/pipeline/{}', 'node': '/node/{}/'}
+BATCH_PATHS = {'pipeline': '/pipelines', 'node': '/nodes'}
+
+
+class Client:
+    """Asynchronous client for the Egon Status API"""
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 10,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff: float = 0.1,
+        batch_window: Optional[float] = None,
+        batch_size: int = 100
+    ) -> None:
+        """Initialize a new client instance
+
+        Args:
+            url: Base URL of the API server, including the API version root (e.g., ``http://localhost:5000/v1``)
+            pool_size: Maximum number of concurrent keep-alive connections
+            timeout: Timeout in seconds for individual HTTP requests
+            max_retries: Number of times to retry a failed request
+            backoff: Base delay in seconds used when calculating retry delays
+            batch_window: Optionally collect calls made within this many seconds and dispatch them together
+            batch_size: Maximum number of IDs to request in a single batched request
+        """
+
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='egon-client')
+
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = dict()
+        self._flush_task: Optional[asyncio.Task] = None  # Task collecting calls for the open batch window
+        self._flush_tasks: Set[asyncio.Task] = set()  # All batches that have not finished dispatching
+
+    async def __aenter__(self) -> 'Client':
+        """Return the client for use as an asynchronous context manager"""
+
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        """Close the client when exiting the context manager"""
+
+        await self.close()
+
+    async def close(self) -> None:
+        """Dispatch any pending calls and release all pooled connections"""
+
+        while self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
+
+        self._session.close()
+
+        # Wait for worker threads without blocking the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self._executor.shutdown, wait=True))
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Return a jittered delay before retrying a failed request
+
+        Args:
+            attempt: The number of attempts already made
+
+        Returns:
+            A random delay between zero and the exponential backoff limit
+        """
+
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    def _send(self, path: str, params: Optional[dict] = None) -> requests.Response:
+        """Send a blocking GET request using the pooled session"""
+
+        return self._session.get(self.url + path, params=params, timeout=self.timeout)
+
+    async def _request(self, path: str, params: Optional[dict] = None) -> Union[dict, list]:
+        """Fetch JSON data from the API, retrying on connection errors and retryable status codes
+
+        Args:
+            path: The URL path relative to the client's base URL
+            params: Optional query parameters for the request
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            requests.HTTPError: If the server returns an error status code
+            requests.RequestException: If the request fails after all retries
+        """
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await loop.run_in_executor(self._executor, self._send, path, params)
+
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+
+            await asyncio.sleep(self._retry_delay(attempt))
+
+    def _not_found(self, object_type: str, egon_id: str) -> requests.HTTPError:
+        """Return the error raised for an object missing from a batched response
+
+        The error mirrors the one raised by a single lookup, including a
+        response object with a 404 status code.
+        """
+
+        response = requests.Response()
+        response.status_code = 404
+        response.reason = 'Not Found'
+        response.url = self.url + SINGLE_PATHS[object_type].format(quote(egon_id, safe=''))
+        return requests.HTTPError(f'404 Client Error: Not Found for url: {response.url}', response=response)
+
+    async def _resolve_batch(self, object_type: str, futures: Dict[str, asyncio.Future]) -> None:
+        """Fetch a batch of objects of the same type and store each outcome on its future
+
+        Args:
+            object_type: The type of object to fetch (``pipeline`` or ``node``)
+            futures: Futures awaiting each object, keyed by Egon ID
+        """
+
+        try:
+            records = await self._request(BATCH_PATHS[object_type], params={'ids': list(futures)})
+
+        except Exception as excep:
+            for future in futures.values():
+                future.set_exception(excep)
+
+            return
+
+        found = {record['egon_id']: record for record in records}
+        for egon_id, future in futures.items():
+            if egon_id in found:
+                future.set_result(found[egon_id])
+
+            else:
+                future.set_exception(self._not_found(object_type, egon_id))
+
+    async def _flush(self) -> None:
+        """Wait for the batch window to close and dispatch batched requests for each object type concurrently"""
+
+        await asyncio.sleep(self.batch_window)
+        pending, self._pending = self._pending, dict()
+        self._flush_task = None
+
+        by_type: Dict[str, Dict[str, asyncio.Future]] = defaultdict(dict)
+        for (object_type, egon_id), future in pending.items():
+            by_type[object_type][egon_id] = future
+
+        batches = []
+        for object_type, futures in by_type.items():
+            egon_ids = list(futures)
+            for start in range(0, len(egon_ids), self.batch_size):
+                chunk = egon_ids[start:start + self.batch_size]
+                batches.append(self._resolve_batch(object_type, {egon_id: futures[egon_id] for egon_id in chunk}))
+
+        await asyncio.gather(*batches)
+
+    async def _get(self, object_type: str, egon_id: str) -> dict:
+        """Fetch an object from the API, batching the call if a batch window is configured"""
+
+        if not self.batch_window:
+            return await self._request(SINGLE_PATHS[object_type].format(quote(egon_id, safe='')))
+
+        key = (object_type, egon_id)
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = asyncio.get_running_loop().create_future()
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+            self._flush_tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._flush_tasks.discard)
+
+        # Shield the shared future so one cancelled caller does not cancel the others
+        return await asyncio.shield(future)
+
+    async def get_pipeline(self, pipeline_id: str) -> dict:
+        """Fetch data describing an egon pipeline
+
+        Args:
+            pipeline_id: The pipeline ID assigned by Egon
+
+        Returns:
+            The pipeline metadata returned by the API
+        """
+
+        return await self._get('pipeline', pipeline_id)
+
+    async def get_node(self, node_id: str) -> dict:
+        """Fetch data describing an egon node
+
+        Args:
+            node_id: The node ID assigned by Egon
+
+        Returns:
+            The node metadata returned by the API
+        """
+
+        return await self._get('node', node_id)
@@ -0,0 +1,382 @@
+"""ASGI middleware for compressing HTTP responses.
+
+The ``CompressionMiddleware`` class compresses response bodies using the
+best encoding accepted by the client. Gzip is always available. Brotli
+(``br``) and Zstandard (``zstd``) are supported when the optional
+``brotli`` and ``zstandard`` packages are installed.
+
+Complete response bodies smaller than a minimum size are sent uncompressed.
+Streaming responses are compressed chunk by chunk, with each chunk flushed
+to the client as it is produced. Compressed copies of complete, cacheable
+response bodies are kept in a size-limited in-memory cache keyed by a
+digest of the uncompressed body, so frequently served payloads are only
+compressed once. A response is cacheable if it is a ``200`` response to a
+``GET`` or ``HEAD`` request whose ``Cache-Control`` header explicitly
+allows caching (``public`` or ``max-age``) and does not include the
+``no-store``, ``no-cache``, or ``private`` directives.
+"""
+
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple, Union
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class GzipCodec:
+    """Gzip compression using the standard library"""
+
+    name = 'gzip'
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a complete payload"""
+
+        compressor = zlib.compressobj(self.level, wbits=zlib.MAX_WBITS | 16)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self) -> 'StreamCompressor':
+        """Return a compressor for streaming payloads"""
+
+        compressor = zlib.compressobj(self.level, wbits=zlib.MAX_WBITS | 16)
+        return StreamCompressor(
+            compress=lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+            finish=compressor.flush)
+
+
+class BrotliCodec:
+    """Brotli compression using the optional ``brotli`` package"""
+
+    name = 'br'
+
+    def __init__(self, quality: int = 5) -> None:
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a complete payload"""
+
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> 'StreamCompressor':
+        """Return a compressor for streaming payloads"""
+
+        compressor = brotli.Compressor(quality=self.quality)
+        return StreamCompressor(
+            compress=lambda chunk: compressor.process(chunk) + compressor.flush(),
+            finish=compressor.finish)
+
+
+class ZstdCodec:
+    """Zstandard compression using the optional ``zstandard`` package
+
+    A ``zstandard.ZstdCompressor`` holds a single compression context, so a
+    new compressor is created for every payload. Sharing one compressor
+    corrupts the output of responses compressed concurrently.
+    """
+
+    name = 'zstd'
+
+    def __init__(self, level: int = 3) -> None:
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a complete payload"""
+
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def stream(self) -> 'StreamCompressor':
+        """Return a compressor for streaming payloads"""
+
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        return StreamCompressor(
+            compress=lambda chunk: compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            finish=compressor.flush)
+
+
+class StreamCompressor:
+    """Incremental compressor returned by the ``stream`` method of each codec"""
+
+    def __init__(self, compress, finish) -> None:
+        """Wrap the given compression callables
+
+        Args:
+            compress: Callable returning the compressed and flushed bytes for a chunk of data
+            finish: Callable returning the final bytes of the compressed stream
+        """
+
+        self.compress = compress
+        self.finish = finish
+
+
+Codec = Union[GzipCodec, BrotliCodec, ZstdCodec]
+
+
+def available_codecs() -> Dict[str, Codec]:
+    """Return the supported codecs keyed by encoding name in order of server preference"""
+
+    codecs = []
+    if brotli is not None:
+        codecs.append(BrotliCodec())
+
+    if zstandard is not None:
+        codecs.append(ZstdCodec())
+
+    codecs.append(GzipCodec())
+    return {codec.name: codec for codec in codecs}
+
+
+def negotiate_encoding(accept_encoding: str, supported: Tuple[str, ...]) -> Optional[str]:
+    """Choose a content encoding from the value of an ``Accept-Encoding`` header
+
+    Encodings are ranked by the client's quality values. Ties are broken
+    using the order of the ``supported`` argument.
+
+    Args:
+        accept_encoding: The ``Accept-Encoding`` request header
+        supported: Encodings supported by the server, in order of preference
+
+    Returns:
+        The selected encoding or ``None`` if no supported encoding is acceptable
+    """
+
+    qualities = dict()
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+
+            except ValueError:
+                continue
+
+        qualities[name] = quality
+
+    wildcard = qualities.get('*', 0)
+    candidates = [(qualities.get(name, wildcard), -rank, name) for rank, name in enumerate(supported)]
+    quality, _, name = max(candidates, default=(0, 0, None))
+    return name if quality > 0 else None
+
+
+CACHEABLE_METHODS = frozenset({'GET', 'HEAD'})
+CACHE_ALLOW_DIRECTIVES = frozenset({'public', 'max-age'})
+CACHE_DENY_DIRECTIVES = frozenset({'no-store', 'no-cache', 'private'})
+
+
+def cache_directives(cache_control: str) -> Set[str]:
+    """Return the lower-cased directive names in the value of a ``Cache-Control`` header
+
+    Args:
+        cache_control: The ``Cache-Control`` header value
+
+    Returns:
+        Directive names with any arguments removed (e.g., ``max-age=60`` becomes ``max-age``)
+    """
+
+    directives = (item.partition('=')[0].strip().lower() for item in cache_control.split(','))
+    return {directive for directive in directives if directive}
+
+
+class CompressionCache:
+    """Size limited LRU cache of compressed response bodies"""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize an empty cache
+
+        Args:
+            max_size: Maximum combined size in bytes of all cached bodies
+        """
+
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def key(encoding: str, body: bytes) -> Tuple[str, bytes]:
+        """Return the cache key for a body compressed with the given encoding"""
+
+        return encoding, hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        """Return the cached body for the given key, if any"""
+
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+
+        return body
+
+    def put(self, key: Tuple[str, bytes], body: bytes) -> None:
+        """Add a compressed body to the cache, evicting the least recently used bodies as necessary"""
+
+        if len(body) > self.max_size or key in self._entries:
+            return
+
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses according to the client's ``Accept-Encoding`` header"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, cache_size: int = 0) -> None:
+        """Wrap an ASGI application
+
+        Args:
+            app: The application to wrap
+            minimum_size: Complete response bodies smaller than this many bytes are not compressed
+            cache_size: Maximum bytes of compressed bodies to cache (0 disables the cache)
+        """
+
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codecs = available_codecs()
+        self.cache = CompressionCache(cache_size) if cache_size > 0 else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'http':
+            accept_encoding = Headers(scope=scope).get('Accept-Encoding', '')
+            encoding = negotiate_encoding(accept_encoding, tuple(self.codecs))
+            if encoding is not None:
+                responder = CompressionResponder(self, self.codecs[encoding])
+                await responder(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    """Compresses the response to a single request"""
+
+    def __init__(self, middleware: CompressionMiddleware, codec: Codec) -> None:
+        """Initialize the responder
+
+        Args:
+            middleware: The middleware instance handling the request
+            codec: The codec used to compress the response
+        """
+
+        self.middleware = middleware
+        self.codec = codec
+        self.method = ''
+        self.send: Optional[Send] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.stream: Optional[StreamCompressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        self.method = scope.get('method', '')
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    def _is_cacheable(self) -> bool:
+        """Return whether the compressed response body may be cached"""
+
+        if self.middleware.cache is None:
+            return False
+
+        if self.method not in CACHEABLE_METHODS or self.initial_message.get('status') != 200:
+            return False
+
+        directives = cache_directives(Headers(raw=self.initial_message['headers']).get('Cache-Control', ''))
+        return bool(directives & CACHE_ALLOW_DIRECTIVES) and not directives & CACHE_DENY_DIRECTIVES
+
+    def _compress_body(self, body: bytes) -> bytes:
+        """Compress a complete response body, using the cache where possible"""
+
+        if not self._is_cacheable():
+            return self.codec.compress(body)
+
+        key = self.middleware.cache.key(self.codec.name, body)
+        compressed = self.middleware.cache.get(key)
+        if compressed is None:
+            compressed = self.codec.compress(body)
+            self.middleware.cache.put(key, compressed)
+
+        return compressed
+
+    def _set_encoding_headers(self, content_length: Optional[int]) -> None:
+        """Update headers in the initial response message to reflect the compressed body"""
+
+        headers = MutableHeaders(raw=self.initial_message['headers'])
+        headers['Content-Encoding'] = self.codec.name
+        headers.add_vary_header('Accept-Encoding')
+        if content_length is None:
+            del headers['Content-Length']
+
+        else:
+            headers['Content-Length'] = str(content_length)
+
+    async def send_compressed(self, message: Message) -> None:
+        """Compress outgoing response messages before forwarding them to the client"""
+
+        message_type = message['type']
+        if message_type == 'http.response.start':
+            # Hold the initial message until the response headers can be finalized
+            self.initial_message = message
+            self.passthrough = 'content-encoding' in Headers(raw=message['headers'])
+            return
+
+        if message_type != 'http.response.body':
+            await self.send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if not self.started:
+            self.started = True
+            if self.passthrough or (not more_body and len(body) < self.middleware.minimum_size):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+
+            elif not more_body:
+                message['body'] = self._compress_body(body)
+                self._set_encoding_headers(len(message['body']))
+                await self.send(self.initial_message)
+                await self.send(message)
+
+            else:
+                self.stream = self.codec.stream()
+                self._set_encoding_headers(None)
+                message['body'] = self.stream.compress(body)
+                await self.send(self.initial_message)
+                await self.send(message)
+
+        elif self.passthrough:
+            await self.send(message)
+
+        else:
+            message['body'] = self.stream.compress(body)
+            if not more_body:
+                message['body'] += self.stream.finish()
+
+            await self.send(message)
@@ -0,0 +1,387 @@
+"""Storage, retention, and querying of pipeline and node status history.
+
+Raw status samples are appended to the ``status_history`` table, which is
+range partitioned into one partition per day (UTC). Partitions are created
+on demand as samples are ingested. Samples timestamped before the raw
+retention cutoff, or further ahead of the server clock than the
+``history_max_clock_skew`` setting, are rejected.
+
+Samples age through three tiers of storage. Raw samples older than the
+``history_raw_retention`` setting are downsampled into hourly rollups and
+their daily partition is dropped whole. Hourly rollups older than
+``history_hourly_retention`` are downsampled into daily rollups, and daily
+rollups older than ``history_daily_retention`` are deleted. The
+``apply_retention`` function performs one pass of this process and is run
+periodically as a background job or on demand from the command line.
+
+Retention is applied in a series of short transactions so ingestion and
+queries are never blocked for a whole pass. Each expired partition is first
+detached from the ``status_history`` table (concurrently on PostgreSQL 14
+and newer), after which its rollups are written and the detached table is
+dropped in a single transaction. A pass interrupted part way through is
+resumed by the next one without double counting any samples.
+
+Because each sample lives in exactly one tier at a time, range queries are
+answered by combining all three tiers into rollups of the requested
+resolution.
+
+When the application database is sharded, the history of each pipeline or
+node is stored on the shard owning its Egon ID.
+"""
+
+import asyncio
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import column, delete, func, insert, literal, literal_column, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from . import orm
+from .settings import SETTINGS
+
+RESOLUTIONS = ('hour', 'day')
+PARTITION_PREFIX = f'{orm.StatusHistory.__tablename__}_'
+RETENTION_LOCK_ID = 0x45474F4E  # Advisory lock preventing concurrent retention runs across workers
+
+# Partitions known to exist as (shard index, day), cached to avoid issuing DDL on every insert
+_known_partitions: Set[Tuple[int, date]] = set()
+
+
+def as_utc(timestamp: datetime) -> datetime:
+    """Return a timezone aware copy of a timestamp in UTC, treating naive timestamps as UTC"""
+
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+
+    return timestamp.astimezone(timezone.utc)
+
+
+def day_start(day: date) -> datetime:
+    """Return the start of the given day in UTC"""
+
+    return datetime.combine(day, time(), tzinfo=timezone.utc)
+
+
+def partition_name(day: date) -> str:
+    """Return the name of the ``status_history`` partition holding samples for the given day"""
+
+    return f'{PARTITION_PREFIX}{day:%Y%m%d}'
+
+
+def partition_day(name: str) -> date:
+    """Return the day covered by the ``status_history`` partition with the given name"""
+
+    return datetime.strptime(name[len(PARTITION_PREFIX):], '%Y%m%d').date()
+
+
+def raw_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Return the timestamp before which raw samples are downsampled by the retention job"""
+
+    today = as_utc(now or datetime.now(timezone.utc)).date()
+    return day_start(today - timedelta(days=SETTINGS.history_raw_retention))
+
+
+def validate_timestamps(timestamps: Iterable[datetime], now: Optional[datetime] = None) -> None:
+    """Check sample timestamps fall within the range accepted into raw history
+
+    Args:
+        timestamps: The timestamps to check
+        now: The current time used to calculate the accepted range
+
+    Raises:
+        ValueError: If a timestamp is before the raw retention cutoff or too far in the future
+    """
+
+    now = as_utc(now or datetime.now(timezone.utc))
+    earliest = raw_cutoff(now)
+    latest = now + timedelta(seconds=SETTINGS.history_max_clock_skew)
+    for timestamp in map(as_utc, timestamps):
+        if not earliest <= timestamp <= latest:
+            raise ValueError(
+                f'Samples must be recorded between {earliest.isoformat()} and {latest.isoformat()}, '
+                f'got {timestamp.isoformat()}')
+
+
+def truncate(resolution: str, column):
+    """Return an expression truncating a timestamp column to the start of its UTC hour or day
+
+    The resolution is rendered inline so identical expressions in ``SELECT``
+    and ``GROUP BY`` clauses are recognized as equal by the database.
+    """
+
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f'Resolution must be one of {RESOLUTIONS}')
+
+    return func.date_trunc(literal_column(f"'{resolution}'"), column, literal_column("'UTC'"))
+
+
+async def create_partitions(session: AsyncSession, days: Iterable[date], shard: int = 0) -> None:
+    """Create ``status_history`` partitions for the given days if they do not already exist
+
+    Args:
+        session: The database session to create partitions with
+        days: The days to create partitions for
+        shard: Index of the database shard the session is connected to
+    """
+
+    for day in sorted(day for day in set(days) if (shard, day) not in _known_partitions):
+        await session.execute(text(
+            f'CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF {orm.StatusHistory.__tablename__} '
+            f"FOR VALUES FROM ('{day_start(day).isoformat()}') TO ('{day_start(day + timedelta(days=1)).isoformat()}')"
+        ))
+
+
+async def list_partitions(session: AsyncSession) -> List[date]:
+    """Return the days covered by existing ``status_history`` partitions
+
+    Args:
+        session: The database session to query with
+
+    Returns:
+        A sorted list of days
+    """
+
+    query = text(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class parent ON pg_inherits.inhparent = parent.oid '
+        'JOIN pg_class child ON pg_inherits.inhrelid = child.oid '
+        'WHERE parent.relname = :parent')
+
+    result = await session.execute(query, {'parent': orm.StatusHistory.__tablename__})
+    return sorted(partition_day(name) for name in result.scalars())
+
+
+async def list_detached_partitions(session: AsyncSession) -> List[date]:
+    """Return the days covered by ``status_history`` partitions that were detached but not yet dropped
+
+    Args:
+        session: The database session to query with
+
+    Returns:
+        A sorted list of days
+    """
+
+    query = text(
+        "SELECT relname FROM pg_class WHERE relkind = 'r' AND relname ~ :pattern AND pg_table_is_visible(oid) "
+        'AND NOT EXISTS (SELECT 1 FROM pg_inherits WHERE pg_inherits.inhrelid = pg_class.oid)')
+
+    result = await session.execute(query, {'pattern': f'^{PARTITION_PREFIX}[0-9]{{8}}$'})
+    return sorted(partition_day(name) for name in result.scalars())
+
+
+async def _insert_shard_samples(shard: int, samples: List[dict]) -> None:
+    """Bulk insert status samples into the history table of a single database shard"""
+
+    days = {sample['timestamp'].date() for sample in samples}
+    async with orm.DBConnection.session_makers[shard]() as session:
+        await create_partitions(session, days, shard)
+        await session.execute(insert(orm.StatusHistory), samples)
+        await session.commit()
+
+    _known_partitions.update((shard, day) for day in days)
+
+
+async def insert_samples(samples: List[dict]) -> None:
+    """Bulk insert status samples into the history table
+
+    Samples are grouped by the database shard owning each Egon ID and
+    inserted into each shard concurrently.
+
+    Args:
+        samples: Dictionaries with ``object_type``, ``egon_id``, ``status``, and ``timestamp`` keys
+
+    Raises:
+        ValueError: If a sample timestamp is outside the range accepted by ``validate_timestamps``
+    """
+
+    validate_timestamps(sample['timestamp'] for sample in samples)
+    shard_samples: Dict[int, List[dict]] = defaultdict(list)
+    for sample in samples:
+        shard = orm.DBConnection.shard_index(sample['egon_id'])
+        shard_samples[shard].append({**sample, 'timestamp': as_utc(sample['timestamp'])})
+
+    await asyncio.gather(*(_insert_shard_samples(shard, batch) for shard, batch in shard_samples.items()))
+
+
+def _upsert_rollups(query) -> pg_insert:
+    """Return a statement adding the rollup rows selected by ``query`` to the rollup table"""
+
+    columns = ['object_type', 'egon_id', 'status', 'resolution', 'bucket', 'sample_count']
+    statement = pg_insert(orm.StatusRollup).from_select(columns, query)
+    return statement.on_conflict_do_update(
+        index_elements=['object_type', 'egon_id', 'resolution', 'bucket', 'status'],
+        set_={'sample_count': orm.StatusRollup.sample_count + statement.excluded.sample_count})
+
+
+def _raw_rollup_query(resolution: str, day: date):
+    """Return a query aggregating all raw samples in a detached daily partition into rollups"""
+
+    source = table(partition_name(day), *(column(col.name) for col in orm.StatusHistory.__table__.columns))
+    bucket = truncate(resolution, source.c.timestamp)
+    return (
+        select(source.c.object_type, source.c.egon_id, source.c.status, literal(resolution), bucket, func.count())
+        .group_by(source.c.object_type, source.c.egon_id, source.c.status, bucket))
+
+
+async def _detach_partition(connection: AsyncConnection, day: date) -> None:
+    """Detach a daily partition from the ``status_history`` table
+
+    Partitions are detached concurrently where supported (PostgreSQL 14+)
+    so ingestion and queries against other partitions are not blocked.
+
+    Args:
+        connection: A database connection in autocommit mode
+        day: The day covered by the partition
+    """
+
+    parent = orm.StatusHistory.__tablename__
+    name = partition_name(day)
+    if connection.dialect.server_version_info < (14,):
+        await connection.execute(text(f'ALTER TABLE {parent} DETACH PARTITION {name}'))
+        return
+
+    # Finish any concurrent detach left pending by an interrupted run
+    pending = await connection.scalar(
+        text('SELECT inhdetachpending FROM pg_inherits WHERE inhrelid = CAST(:name AS regclass)'), {'name': name})
+
+    mode = 'FINALIZE' if pending else 'CONCURRENTLY'
+    await connection.execute(text(f'ALTER TABLE {parent} DETACH PARTITION {name} {mode}'))
+
+
+async def _expire_partition(shard: int, day: date) -> None:
+    """Downsample a detached daily partition into hourly rollups and drop it in a single transaction"""
+
+    async with orm.DBConnection.session_makers[shard]() as session:
+        await session.execute(_upsert_rollups(_raw_rollup_query('hour', day)))
+        await session.execute(text(f'DROP TABLE {partition_name(day)}'))
+        await session.commit()
+
+
+async def _downsample_rollups(shard: int, now: datetime) -> None:
+    """Downsample expired hourly rollups into daily rollups and delete expired daily rollups"""
+
+    hourly_cutoff = day_start(now.date() - timedelta(days=SETTINGS.history_hourly_retention))
+    daily_cutoff = day_start(now.date() - timedelta(days=SETTINGS.history_daily_retention))
+
+    rollup = orm.StatusRollup
+    bucket = truncate('day', rollup.bucket)
+    hourly_query = (
+        select(
+            rollup.object_type, rollup.egon_id, rollup.status,
+            literal('day'), bucket, func.sum(rollup.sample_count))
+        .where(rollup.resolution == 'hour', rollup.bucket < hourly_cutoff)
+        .group_by(rollup.object_type, rollup.egon_id, rollup.status, bucket))
+
+    async with orm.DBConnection.session_makers[shard]() as session:
+        await session.execute(_upsert_rollups(hourly_query))
+        await session.execute(delete(rollup).where(rollup.resolution == 'hour', rollup.bucket < hourly_cutoff))
+        await session.execute(delete(rollup).where(rollup.resolution == 'day', rollup.bucket < daily_cutoff))
+        await session.commit()
+
+
+async def _apply_shard_retention(shard: int, now: datetime) -> None:
+    """Downsample and expire status history stored on a single database shard"""
+
+    raw_expiration = raw_cutoff(now)
+
+    # The session level advisory lock is held on a dedicated autocommit connection, which is also
+    # used for partition DDL that cannot run inside a transaction block
+    async with orm.DBConnection.engines[shard].connect() as connection:
+        connection = await connection.execution_options(isolation_level='AUTOCOMMIT')
+        if not await connection.scalar(select(func.pg_try_advisory_lock(RETENTION_LOCK_ID))):
+            return
+
+        try:
+            async with orm.DBConnection.session_makers[shard]() as session:
+                expired = [day for day in await list_partitions(session) if day_start(day) < raw_expiration]
+                detached = await list_detached_partitions(session)
+
+            # Partitions left detached by an interrupted run have not been downsampled yet
+            for day in detached:
+                await _expire_partition(shard, day)
+
+            for day in expired:
+                await _detach_partition(connection, day)
+                _known_partitions.discard((shard, day))
+                await _expire_partition(shard, day)
+
+            await _downsample_rollups(shard, now)
+
+        finally:
+            await connection.execute(select(func.pg_advisory_unlock(RETENTION_LOCK_ID)))
+
+
+async def apply_retention(now: Optional[datetime] = None) -> None:
+    """Downsample and expire status history according to the application retention settings
+
+    Retention rules are applied to every database shard concurrently. Only
+    one retention run may execute on a shard at a time. Calls made while
+    another run is in progress skip the busy shard. Each partition and the
+    rollup maintenance are processed in their own short transactions.
+
+    Args:
+        now: The current time used to calculate retention cutoffs
+    """
+
+    now = as_utc(now or datetime.now(timezone.utc))
+    shards = range(len(orm.DBConnection.session_makers))
+    await asyncio.gather(*(_apply_shard_retention(shard, now) for shard in shards))
+
+
+async def query_rollups(object_type: str, egon_id: str, start: datetime, end: datetime, resolution: str) -> List[dict]:
+    """Return status counts for a pipeline or node aggregated into time buckets
+
+    Counts are combined across raw samples and stored rollups. Data that has
+    already been downsampled below the requested resolution is reported at
+    its stored resolution (e.g., hourly requests for old data return no rows).
+
+    Args:
+        object_type: The type of object (``pipeline`` or ``node``)
+        egon_id: Egon ID of the pipeline or node
+        start: Start of the time range (inclusive)
+        end: End of the time range (exclusive)
+        resolution: The width of the returned time buckets (``hour`` or ``day``)
+
+    Returns:
+        A list of dictionaries with ``bucket``, ``status``, and ``count`` keys ordered by bucket
+
+    Raises:
+        ValueError: If the resolution is not supported
+    """
+
+    start, end = as_utc(start), as_utc(end)
+    raw = orm.StatusHistory
+    rollup = orm.StatusRollup
+
+    raw_bucket = truncate(resolution, raw.timestamp)
+    queries = [
+        select(raw_bucket, raw.status, func.count())
+        .where(raw.object_type == object_type, raw.egon_id == egon_id, raw.timestamp >= start, raw.timestamp < end)
+        .group_by(raw_bucket, raw.status)
+    ]
+
+    # Stored rollups at or below the requested resolution are re-bucketed to the requested resolution
+    for stored_resolution in RESOLUTIONS[:RESOLUTIONS.index(resolution) + 1]:
+        bucket = truncate(resolution, rollup.bucket)
+        queries.append(
+            select(bucket, rollup.status, func.sum(rollup.sample_count))
+            .where(
+                rollup.object_type == object_type,
+                rollup.egon_id == egon_id,
+                rollup.resolution == stored_resolution,
+                rollup.bucket >= start,
+                rollup.bucket < end)
+            .group_by(bucket, rollup.status))
+
+    counts = Counter()
+    async with orm.DBConnection.route(egon_id)() as session:
+        for query in queries:
+            for bucket, status, count in await session.execute(query):
+                counts[(as_utc(bucket), status)] += count
+
+    return [
+        {'bucket': bucket.isoformat(), 'status': status, 'count': count}
+        for (bucket, status), count in sorted(counts.items())
+    ]
@@ -0,0 +1,67 @@
+"""Background jobs that run for the lifetime of the API server.
+
+Jobs are registered against the application's startup and shutdown events
+by the ``api.AppFactory`` class. Each server worker runs its own copy of
+every job.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+
+class PeriodicJob:
+    """Background task that awaits a coroutine function on a fixed interval"""
+
+    def __init__(self, func: Callable[[], Awaitable], interval: float, run_immediately: bool = False) -> None:
+        """Initialize the job
+
+        Args:
+            func: The coroutine function to run
+            interval: Number of seconds between runs
+            run_immediately: Run the job once at startup instead of waiting for the first interval to pass
+
+        Raises:
+            ValueError: If the interval is not positive
+        """
+
+        if interval <= 0:
+            raise ValueError(f'Job interval must be positive, got {interval}')
+
+        self.func = func
+        self.interval = interval
+        self.run_immediately = run_immediately
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_once(self) -> None:
+        """Run the job, logging any errors instead of raising them"""
+
+        try:
+            await self.func()
+
+        except Exception as excep:
+            name = getattr(self.func, '__qualname__', repr(self.func))
+            logging.getLogger('file_logger').error(f'Background job {name} failed', exc_info=excep)
+
+    async def _run(self) -> None:
+        """Run the job on a fixed interval until cancelled"""
+
+        if self.run_immediately:
+            await self._run_once()
+
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._run_once()
+
+    async def start(self) -> None:
+        """Start running the job in the background"""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background job"""
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,26 @@
+"""Database schema migration for schema version 0.2."""
+
+from alembic import op
+
+# Revision identifiers used by Alembic
+revision = '0.2'
+down_revision = '0.1'
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade from previous database versions to the current revision"""
+
+    # Trigram indexes support fast prefix and substring matching on object names
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in ('pipeline', 'node'):
+        op.create_index(
+            f'ix_{table}_name_trgm', table, ['name'],
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade from the current database versions to the previous revision"""
+
+    for table in ('pipeline', 'node'):
+        op.drop_index(f'ix_{table}_name_trgm', table_name=table)
@@ -0,0 +1,43 @@
+"""Database schema migration for schema version 0.3."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers used by Alembic
+revision = '0.3'
+down_revision = '0.2'
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade from previous database versions to the current revision"""
+
+    # Daily partitions are created on demand when samples are ingested
+    op.create_table(
+        'status_history',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False, default=sa.func.now()),
+        sa.Column('object_type', sa.String(), nullable=False),
+        sa.Column('egon_id', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'timestamp'),
+        postgresql_partition_by='RANGE (timestamp)')
+
+    op.create_index('ix_status_history_object', 'status_history', ['object_type', 'egon_id', 'timestamp'])
+
+    op.create_table(
+        'status_rollup',
+        sa.Column('object_type', sa.String(), nullable=False),
+        sa.Column('egon_id', sa.String(), nullable=False),
+        sa.Column('resolution', sa.String(), nullable=False),
+        sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('object_type', 'egon_id', 'resolution', 'bucket', 'status'))
+
+
+def downgrade() -> None:
+    """Downgrade from the current database versions to the previous revision"""
+
+    op.drop_table('status_rollup')
+    op.drop_table('status_history')  # Dropping the parent table also drops all partitions
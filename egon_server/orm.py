@@ -1,20 +1,84 @@
 """Object relational mapper for the application database."""
 
+import asyncio
+import hashlib
+from bisect import bisect
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Awaitable, List, Optional, Callable, Sequence, TypeVar
 
 from requests import Session
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, func
 from sqlalchemy import Connection
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-__db_version__ = '0.1'  # Schema version used to track/manage DB migrations
+__db_version__ = '0.3'  # Schema version used to track/manage DB migrations
 MIGRATIONS_DIR = Path(__file__).parent / 'migrations'
 
 Base = declarative_base()
+T = TypeVar('T')
+
+
+class HashRing:
+    """Consistent hash ring for distributing keys across database shards
+
+    Each shard is placed on the ring at several pseudo-random points
+    (replicas). Keys are assigned to the first shard found clockwise from
+    the key's own position on the ring, so adding a shard only moves the
+    keys falling between the new shard's points and their predecessors.
+    """
+
+    def __init__(self, shards: Sequence[str], replicas: int = 128) -> None:
+        """Build a ring for the given shards
+
+        Args:
+            shards: Unique, stable names identifying each shard
+            replicas: Number of points placed on the ring for each shard
+        """
+
+        if not shards:
+            raise ValueError('At least one shard is required')
+
+        points = sorted(
+            (self._hash(f'{shard}#{replica}'), index)
+            for index, shard in enumerate(shards)
+            for replica in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._shards = [index for _, index in points]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        """Return a hash of the given value that is stable across processes"""
+
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], 'big')
+
+    def get_shard(self, key: str) -> int:
+        """Return the index of the shard responsible for the given key
+
+        Args:
+            key: The key to locate
+
+        Returns:
+            The position of the owning shard in the list used to build the ring
+        """
+
+        index = bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._shards[index]
+
+
+def shard_name(url: str) -> str:
+    """Return a stable name identifying a database shard, independent of its credentials
+
+    Args:
+        url: URL information for the shard database
+    """
+
+    parsed = make_url(url)
+    identity = URL.create(parsed.drivername, host=parsed.host, port=parsed.port, database=parsed.database)
+    return identity.render_as_string()
 
 
 class DBConnection:
@@ -24,28 +88,79 @@ class DBConnection:
     database. Use the ``configure`` method to change the location of the
     underlying application database. Changes made via this class will
     propagate to the entire parent application.
+
+    When configured with multiple database URLs, data is sharded across the
+    databases by Egon ID. Use the ``route`` method to get a session for the
+    shard owning a given ID, and the ``scatter`` method to run a query
+    against every shard concurrently. The ``session_maker`` attribute always
+    refers to the first shard.
     """
 
     engine: Optional[AsyncEngine] = None
     connection: Optional[Connection] = None
     session_maker: Optional[Callable[[], Session]] = None
+    engines: List[AsyncEngine] = []
+    session_makers: List[Callable[[], AsyncSession]] = []
+    ring: Optional[HashRing] = None
 
     @classmethod
-    def configure(cls, url: str) -> None:
+    def configure(cls, url: str, *shard_urls: str) -> None:
         """Update the connection information for the underlying database
 
         Changes made here will affect the entire running application
 
         Args:
             url: URL information for the application database
+            *shard_urls: URL information for additional database shards
         """
 
         if cls.connection:
             cls.connection.close()
 
+        urls = [url, *shard_urls]
         cls.connection = None
-        cls.engine = create_async_engine(url)
-        cls.session_maker = sessionmaker(cls.engine, class_=AsyncSession)
+        cls.engines = [create_async_engine(shard_url) for shard_url in urls]
+        cls.session_makers = [sessionmaker(engine, class_=AsyncSession) for engine in cls.engines]
+        cls.ring = HashRing([shard_name(shard_url) for shard_url in urls])
+        cls.engine = cls.engines[0]
+        cls.session_maker = cls.session_makers[0]
+
+    @classmethod
+    def shard_index(cls, egon_id: str) -> int:
+        """Return the index of the shard storing data for the given Egon ID
+
+        Args:
+            egon_id: The pipeline or node ID assigned by Egon
+        """
+
+        return cls.ring.get_shard(egon_id)
+
+    @classmethod
+    def route(cls, egon_id: str) -> Callable[[], AsyncSession]:
+        """Return a session factory for the shard storing data for the given Egon ID
+
+        Args:
+            egon_id: The pipeline or node ID assigned by Egon
+        """
+
+        return cls.session_makers[cls.shard_index(egon_id)]
+
+    @classmethod
+    async def scatter(cls, callback: Callable[[AsyncSession], Awaitable[T]]) -> List[T]:
+        """Run a coroutine function against every shard concurrently
+
+        Args:
+            callback: Coroutine function accepting a database session
+
+        Returns:
+            The value returned for each shard, in shard order
+        """
+
+        async def run(session_maker: Callable[[], AsyncSession]) -> T:
+            async with session_maker() as session:
+                return await callback(session)
+
+        return await asyncio.gather(*(run(session_maker) for session_maker in cls.session_makers))
 
 
 @dataclass
@@ -61,6 +176,9 @@ class Pipeline(Base):
     """
 
     __tablename__ = 'pipeline'
+    __table_args__ = (
+        Index('ix_pipeline_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     id: int = Column(Integer, primary_key=True, autoincrement=True)
     egon_id: str = Column(String, nullable=False, unique=True)
@@ -82,9 +200,63 @@ class Node(Base):
     """
 
     __tablename__ = 'node'
+    __table_args__ = (
+        Index('ix_node_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     id: int = Column(Integer, primary_key=True, autoincrement=True)
     egon_id: str = Column(String, nullable=False, unique=True)
     name: str = Column(String, nullable=False)
     description: str = Column(String, nullable=True)
     last_updated: datetime = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
+
+@dataclass
+class StatusHistory(Base):
+    """Append-only history of pipeline and node status samples
+
+    The table is range partitioned by ``timestamp`` with one partition per
+    day. See the ``history`` module for partition management.
+
+    Table Fields:
+      - id          (BigInteger): Primary key for this table (together with ``timestamp``)
+      - timestamp         (Date): The time the status was recorded
+      - object_type     (String): The type of object the status describes (``pipeline`` or ``node``)
+      - egon_id         (String): Egon ID of the pipeline or node
+      - status          (String): The reported status
+    """
+
+    __tablename__ = 'status_history'
+    __table_args__ = (
+        Index('ix_status_history_object', 'object_type', 'egon_id', 'timestamp'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'}
+    )
+
+    id: int = Column(BigInteger, primary_key=True, autoincrement=True)
+    timestamp: datetime = Column(DateTime(timezone=True), primary_key=True, default=func.now())
+    object_type: str = Column(String, nullable=False)
+    egon_id: str = Column(String, nullable=False)
+    status: str = Column(String, nullable=False)
+
+
+@dataclass
+class StatusRollup(Base):
+    """Downsampled counts of pipeline and node status samples
+
+    Table Fields:
+      - object_type  (String): The type of object the status describes (``pipeline`` or ``node``)
+      - egon_id      (String): Egon ID of the pipeline or node
+      - resolution   (String): The width of the time bucket (``hour`` or ``day``)
+      - bucket         (Date): The start of the time bucket
+      - status       (String): The reported status
+      - sample_count (Integer): Number of samples with the given status recorded in the bucket
+    """
+
+    __tablename__ = 'status_rollup'
+
+    object_type: str = Column(String, primary_key=True)
+    egon_id: str = Column(String, primary_key=True)
+    resolution: str = Column(String, primary_key=True)
+    bucket: datetime = Column(DateTime(timezone=True), primary_key=True)
+    status: str = Column(String, primary_key=True)
+    sample_count: int = Column(Integer, nullable=False)
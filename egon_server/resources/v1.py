@@ -1,13 +1,23 @@
 """API resources for API version 1"""
 
+import asyncio
+import logging
+from collections import defaultdict
 from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import Response, JSONResponse
 from fastapi_restful import Resource
-from sqlalchemy import select
+from pydantic import BaseModel, Field
+from sqlalchemy import case, func, select
 
-from egon_server import orm
+from egon_server import history, orm
+from egon_server.search import PrefixIndex, SearchResult, escape_like
+from egon_server.settings import SETTINGS
+from egon_server.summary import StatusSummary
 
 __api_version__ = '1.0'
 
@@ -23,7 +33,7 @@ class Pipeline(Resource):
         """
 
         query = select(orm.Pipeline).where(orm.Pipeline.egon_id == pipelineId)
-        async with orm.DBConnection.session_maker() as session:
+        async with orm.DBConnection.route(pipelineId)() as session:
             result = await session.execute(query)
             db_object = result.scalars().first()
 
@@ -44,7 +54,7 @@ class Node(Resource):
         """
 
         query = select(orm.Node).where(orm.Node.egon_id == nodeId)
-        async with orm.DBConnection.session_maker() as session:
+        async with orm.DBConnection.route(nodeId)() as session:
             result = await session.execute(query)
             db_object = result.scalars().first()
 
@@ -52,3 +62,280 @@ class Node(Resource):
             raise HTTPException(status_code=404)
 
         return JSONResponse(asdict(db_object))
+
+
+async def fetch_by_ids(table: type, egon_ids: List[str]) -> Response:
+    """Fetch records with the given Egon IDs from every shard that stores them
+
+    Args:
+        table: The ORM table to query
+        egon_ids: The Egon IDs to fetch
+
+    Returns:
+        A JSON response listing the records that were found
+    """
+
+    if len(egon_ids) > SETTINGS.batch_max_ids:
+        raise HTTPException(status_code=422, detail=f'At most {SETTINGS.batch_max_ids} IDs may be requested at once')
+
+    shard_ids = defaultdict(list)
+    for egon_id in set(egon_ids):
+        shard_ids[orm.DBConnection.shard_index(egon_id)].append(egon_id)
+
+    async def fetch_shard(shard: int, ids: List[str]) -> list:
+        async with orm.DBConnection.session_makers[shard]() as session:
+            result = await session.execute(select(table).where(table.egon_id.in_(ids)))
+            return result.scalars().all()
+
+    shard_records = await asyncio.gather(*(fetch_shard(shard, ids) for shard, ids in shard_ids.items()))
+    return JSONResponse(jsonable_encoder([asdict(record) for records in shard_records for record in records]))
+
+
+class Pipelines(Resource):
+    """Resource for fetching metadata for multiple pipelines at once"""
+
+    async def get(self, ids: List[str] = Query(...)) -> Response:
+        """Fetch data describing several egon pipelines
+
+        IDs without a matching pipeline are omitted from the response.
+
+        Args:
+            ids: The pipeline IDs assigned by Egon
+        """
+
+        return await fetch_by_ids(orm.Pipeline, ids)
+
+
+class Nodes(Resource):
+    """Resource for fetching metadata for multiple nodes at once"""
+
+    async def get(self, ids: List[str] = Query(...)) -> Response:
+        """Fetch data describing several egon nodes
+
+        IDs without a matching node are omitted from the response.
+
+        Args:
+            ids: The node IDs assigned by Egon
+        """
+
+        return await fetch_by_ids(orm.Node, ids)
+
+
+class Search(Resource):
+    """Resource for searching pipelines and nodes by name"""
+
+    @staticmethod
+    async def _search_table(table: type, q: str, limit: int) -> list:
+        """Return ranked rows from the given table with names containing the search string
+
+        Rows are collected from every database shard and are not sorted across shards.
+        """
+
+        name = func.lower(table.name)
+        rank = case((name == q.lower(), 0), (name.startswith(q.lower(), autoescape=True), 1), else_=2)
+        query = (
+            select(table.egon_id, table.name, rank.label('rank'), func.similarity(table.name, q).label('score'))
+            .where(table.name.ilike(f'%{escape_like(q)}%', escape='\\'))
+            .order_by(rank, func.similarity(table.name, q).desc(), table.name)
+            .limit(limit))
+
+        async def search_shard(session) -> list:
+            return (await session.execute(query)).all()
+
+        return [row for rows in await orm.DBConnection.scatter(search_shard) for row in rows]
+
+    async def get(self, q: str, limit: int = SETTINGS.search_max_results) -> Response:
+        """Search for pipelines and nodes with names matching a search string
+
+        Exact matches are ranked first, followed by prefix matches and then
+        substring matches. Ties are ordered by trigram similarity.
+
+        Args:
+            q: The case-insensitive string to search for
+            limit: The maximum number of results to return
+        """
+
+        if not q:
+            raise HTTPException(status_code=422, detail='Search string cannot be empty')
+
+        limit = max(1, min(limit, SETTINGS.search_max_results))
+        pipelines, nodes = await asyncio.gather(
+            self._search_table(orm.Pipeline, q, limit),
+            self._search_table(orm.Node, q, limit))
+
+        ranked = sorted(
+            [('pipeline', row) for row in pipelines] + [('node', row) for row in nodes],
+            key=lambda item: (item[1].rank, -item[1].score, item[1].name))
+
+        results = [SearchResult(type_, row.egon_id, row.name)._asdict() for type_, row in ranked[:limit]]
+        return JSONResponse(results)
+
+
+class Autocomplete(Resource):
+    """Resource for autocompleting pipeline and node names from a prefix"""
+
+    def __init__(self) -> None:
+        """Initialize the resource with an empty in-memory prefix index"""
+
+        self._index = PrefixIndex()
+        self._rebuild_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _load_entries() -> List[SearchResult]:
+        """Return all pipeline and node names stored across all database shards"""
+
+        async def load_shard(session) -> List[SearchResult]:
+            pipelines = await session.execute(select(orm.Pipeline.egon_id, orm.Pipeline.name))
+            nodes = await session.execute(select(orm.Node.egon_id, orm.Node.name))
+            return [SearchResult('pipeline', *row) for row in pipelines] + [SearchResult('node', *row) for row in nodes]
+
+        return [entry for entries in await orm.DBConnection.scatter(load_shard) for entry in entries]
+
+    async def _query_database(self, prefix: str, limit: int) -> List[SearchResult]:
+        """Return objects with names starting with the given prefix directly from the database"""
+
+        async def query_shard(session) -> List[SearchResult]:
+            results = []
+            for type_, table in (('pipeline', orm.Pipeline), ('node', orm.Node)):
+                query = (
+                    select(table.egon_id, table.name)
+                    .where(table.name.ilike(f'{escape_like(prefix)}%', escape='\\'))
+                    .order_by(table.name)
+                    .limit(limit))
+
+                rows = await session.execute(query)
+                results.extend(SearchResult(type_, *row) for row in rows)
+
+            return results
+
+        results = [result for results in await orm.DBConnection.scatter(query_shard) for result in results]
+        return sorted(results, key=lambda result: result.name.lower())[:limit]
+
+    async def _rebuild_index(self) -> None:
+        """Rebuild the in-memory index from the database"""
+
+        self._index.build(await self._load_entries())
+
+    def _rebuild_done(self, task: asyncio.Task) -> None:
+        """Clear the finished rebuild task, logging any error raised while rebuilding"""
+
+        self._rebuild_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logging.getLogger('file_logger').error('Could not rebuild autocomplete index', exc_info=task.exception())
+
+    async def _query_index(self, prefix: str, limit: int) -> List[SearchResult]:
+        """Return objects with names starting with the given prefix from the in-memory index
+
+        Expired indexes are rebuilt in the background while the existing index
+        continues serving requests. Requests only wait on the rebuild if the
+        index has never been built.
+        """
+
+        if self._index.age() > SETTINGS.search_index_ttl and self._rebuild_task is None:
+            self._rebuild_task = asyncio.create_task(self._rebuild_index())
+            self._rebuild_task.add_done_callback(self._rebuild_done)
+
+        if not self._index.is_built:
+            # Shield the shared rebuild so one cancelled request does not cancel it for the others
+            await asyncio.shield(self._rebuild_task)
+
+        return self._index.search(prefix, limit)
+
+    async def get(self, prefix: str, limit: int = SETTINGS.search_max_results) -> Response:
+        """Fetch pipelines and nodes with names starting with the given prefix
+
+        Results are served from an in-memory index unless the index is
+        disabled via the ``search_index_ttl`` setting.
+
+        Args:
+            prefix: The case-insensitive name prefix to match
+            limit: The maximum number of results to return
+        """
+
+        limit = max(1, min(limit, SETTINGS.search_max_results))
+        if SETTINGS.search_index_ttl > 0:
+            results = await self._query_index(prefix, limit)
+
+        else:
+            results = await self._query_database(prefix, limit)
+
+        return JSONResponse([result._asdict() for result in results])
+
+
+class StatusSample(BaseModel):
+    """A single status sample submitted to the status history"""
+
+    object_type: Literal['pipeline', 'node']
+    egon_id: str
+    status: str
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class StatusHistory(Resource):
+    """Resource for recording pipeline and node status history"""
+
+    async def post(self, samples: List[StatusSample]) -> Response:
+        """Append a batch of status samples to the status history
+
+        Args:
+            samples: The status samples to record
+        """
+
+        try:
+            history.validate_timestamps(sample.timestamp for sample in samples)
+
+        except ValueError as excep:
+            raise HTTPException(status_code=422, detail=str(excep))
+
+        await history.insert_samples([sample.dict() for sample in samples])
+        return JSONResponse({'inserted': len(samples)}, status_code=201)
+
+
+class StatusRollups(Resource):
+    """Resource for fetching aggregated pipeline and node status history"""
+
+    async def get(
+        self,
+        objectType: Literal['pipeline', 'node'],
+        egonId: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        resolution: Literal['hour', 'day'] = 'hour'
+    ) -> Response:
+        """Fetch status counts for a pipeline or node aggregated into time buckets
+
+        Args:
+            objectType: The type of object (``pipeline`` or ``node``)
+            egonId: The pipeline or node ID assigned by Egon
+            start: Start of the time range (inclusive)
+            end: End of the time range (exclusive), defaults to the current time
+            resolution: The width of the returned time buckets
+        """
+
+        end = end or datetime.now(timezone.utc)
+        rollups = await history.query_rollups(objectType, egonId, start, end, resolution)
+        return JSONResponse(rollups)
+
+
+class Summary(Resource):
+    """Resource for precomputed pipeline and node activity counts"""
+
+    def __init__(self, summary: StatusSummary) -> None:
+        """Initialize the resource for a given summary instance
+
+        Args:
+            summary: The summary to serve
+        """
+
+        self._summary = summary
+
+    def get(self) -> Response:
+        """Fetch the most recent pipeline and node activity counts
+
+        The ``refreshed_at`` field of the response indicates when the counts
+        were calculated and is ``null`` until the first refresh completes.
+        Responses may be cached for one refresh interval.
+        """
+
+        headers = {'Cache-Control': f'public, max-age={SETTINGS.summary_refresh_interval}'}
+        return Response(self._summary.body, media_type='application/json', headers=headers)
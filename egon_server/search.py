@@ -0,0 +1,107 @@
+"""Utilities for searching pipelines and nodes by their human-readable name.
+
+Substring searches are executed against the application database, where
+they are accelerated by trigram (``pg_trgm``) indexes on the ``name``
+column of each table. Prefix searches used for autocompletion can optionally
+be served from the ``PrefixIndex`` class, which holds a sorted copy of all
+names in the memory of each server worker.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+
+class SearchResult(NamedTuple):
+    """A single object matching a name search"""
+
+    type: str
+    egon_id: str
+    name: str
+
+
+def escape_like(value: str, escape: str = '\\') -> str:
+    """Escape wildcard characters in a string used in a SQL ``LIKE`` pattern
+
+    Args:
+        value: The string to escape
+        escape: The escape character used by the ``LIKE`` expression
+
+    Returns:
+        A copy of the string with ``%``, ``_``, and the escape character escaped
+    """
+
+    for char in (escape, '%', '_'):
+        value = value.replace(char, escape + char)
+
+    return value
+
+
+class PrefixIndex:
+    """In-memory index supporting case-insensitive prefix lookups
+
+    Entries are held in a list sorted by lower-cased name so that all entries
+    sharing a prefix can be located with a binary search.
+    """
+
+    def __init__(self, entries: Optional[Iterable[SearchResult]] = None) -> None:
+        """Build a new index from the given entries
+
+        An index created without entries is empty and reports an infinite age
+        until it is first built.
+
+        Args:
+            entries: The objects to include in the index
+        """
+
+        self._keys: List[str] = []
+        self._entries: List[SearchResult] = []
+        self.built_at: float = float('-inf')
+        if entries is not None:
+            self.build(entries)
+
+    def build(self, entries: Iterable[SearchResult]) -> None:
+        """Replace the contents of the index with the given entries
+
+        Args:
+            entries: The objects to include in the index
+        """
+
+        pairs: List[Tuple[str, SearchResult]] = sorted((entry.name.lower(), entry) for entry in entries)
+        self._keys = [key for key, _ in pairs]
+        self._entries = [entry for _, entry in pairs]
+        self.built_at = time.monotonic()
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index has been built at least once"""
+
+        return self.built_at != float('-inf')
+
+    def age(self) -> float:
+        """Return the number of seconds since the index was last built"""
+
+        return time.monotonic() - self.built_at
+
+    def search(self, prefix: str, limit: int) -> List[SearchResult]:
+        """Return entries with names starting with the given prefix
+
+        Args:
+            prefix: The case-insensitive name prefix to match
+            limit: The maximum number of entries to return
+
+        Returns:
+            Matching entries ordered alphabetically by name
+        """
+
+        prefix = prefix.lower()
+        results = []
+        index = bisect_left(self._keys, prefix)
+        while index < len(self._keys) and len(results) < limit and self._keys[index].startswith(prefix):
+            results.append(self._entries[index])
+            index += 1
+
+        return results
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -9,7 +9,7 @@ according to the following priority order:
 
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 
 from pydantic import BaseSettings, Field
 
@@ -40,6 +40,47 @@ class Settings(BaseSettings):
     db_host: str = Field(title='Database Host', default='localhost', description='Database host address')
     db_port: int = Field(title='Database Port', default=5432, description='Database port number')
     db_name: str = Field(title='Database Name', default='egon', description='Application database name')
+    db_shards: List[str] = Field(
+        title='Database Shards', default=[],
+        description='Database URIs to shard data across (replaces the single database defined above)')
+
+    # Settings for batch lookups
+    batch_max_ids: int = Field(title='Batch Max IDs', default=100, description='Maximum IDs per batch lookup')
+
+    # Settings for name searches
+    search_max_results: int = Field(title='Search Max Results', default=50, description='Maximum results per search')
+    search_index_ttl: int = Field(
+        title='Search Index TTL', default=60,
+        description='Seconds between rebuilds of the in-memory autocomplete index (0 disables the index)')
+
+    # Settings for status history retention
+    history_raw_retention: int = Field(
+        title='Raw History Retention', default=7, description='Days to keep raw status samples before downsampling')
+    history_hourly_retention: int = Field(
+        title='Hourly History Retention', default=90, description='Days to keep hourly rollups before downsampling')
+    history_daily_retention: int = Field(
+        title='Daily History Retention', default=730, description='Days to keep daily rollups before deleting')
+    history_retention_interval: int = Field(
+        title='History Retention Interval', default=3600,
+        description='Seconds between background retention runs (0 disables the background job)')
+    history_max_clock_skew: int = Field(
+        title='History Max Clock Skew', default=300,
+        description='Seconds a submitted sample may be timestamped ahead of the server clock')
+
+    # Settings for the status summary
+    summary_refresh_interval: int = Field(
+        title='Summary Refresh Interval', default=30, gt=0, description='Seconds between status summary refreshes')
+    summary_recent_window: int = Field(
+        title='Summary Recent Window', default=300, description='Seconds within which an update counts as recent')
+    summary_stale_after: int = Field(
+        title='Summary Stale Threshold', default=3600, description='Seconds without updates before a record is stale')
+
+    # Settings for HTTP response compression
+    compression_minimum_size: int = Field(
+        title='Compression Minimum Size', default=500, description='Minimum response size in bytes to compress')
+    compression_cache_size: int = Field(
+        title='Compression Cache Size', default=16_000_000,
+        description='Maximum bytes of compressed responses to cache per worker (0 disables the cache)')
 
     # Settings for application logs
     log_path: Optional[Path] = Field(title='Log Path', default=None, description='Log file path')
@@ -53,6 +94,14 @@ class Settings(BaseSettings):
 
         return f'postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}'
 
+    def get_db_uris(self) -> List[str]:
+        """Return the fully qualified URI of every database shard
+
+        Returns the single application database URI if sharding is not configured.
+        """
+
+        return list(self.db_shards) or [self.get_db_uri()]
+
     def get_logging_config(self) -> dict:
         """Return a dictionary with configuration settings for the Python logger"""
 
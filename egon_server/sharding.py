@@ -0,0 +1,206 @@
+"""Tools for redistributing application data when database shards are added.
+
+Pipeline data is assigned to database shards using the consistent hash ring
+defined by ``orm.HashRing``. Adding a shard to the ring reassigns a fraction
+of Egon IDs from the existing shards to the new one. The ``rebalance``
+function moves the records for those IDs to their new owner.
+
+New shards must be migrated to the current schema version before data is
+rebalanced onto them. Rebalancing may run while API servers configured with
+the new list of shards are serving traffic, so records for a reassigned Egon
+ID can already exist on its new shard. Moved records are merged with them
+instead of replacing them:
+
+  - Pipeline and node records already present on the new shard are kept and
+    the moved copy is discarded.
+  - Rollup counts for the same object, status, and time bucket are summed.
+  - Status samples already present with the same Egon ID, timestamp, and
+    status are skipped.
+
+Records are moved in pages of ``BATCH_SIZE`` rows. Each page is deleted from
+the old shard in a transaction that is only committed once the page has been
+committed to the new shard, so an interrupted rebalance can safely be run
+again. A failure between the two commits leaves a single page on both shards,
+in which case rerunning the rebalance merges the duplicate copies as described
+above (rollup counts in that page are counted twice).
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence
+
+from sqlalchemy import delete, insert, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from . import history, orm
+
+SHARDED_TABLES = (orm.Pipeline, orm.Node, orm.StatusRollup, orm.StatusHistory)
+BATCH_SIZE = 500
+
+
+def _copied_columns(table: type) -> list:
+    """Return the columns copied between shards, excluding autoincrementing keys reassigned by the target database"""
+
+    return [column for column in table.__table__.columns if column.autoincrement is not True]
+
+
+def _new_records(records: List[dict], existing: set, key_columns: Sequence[str]) -> List[dict]:
+    """Return the records whose values for the given columns are not in the set of existing keys
+
+    Args:
+        records: The records to filter
+        existing: Tuples of key values already stored on the target shard
+        key_columns: Names of the columns identifying a record
+
+    Returns:
+        The filtered records, excluding duplicates within ``records``
+    """
+
+    new = []
+    seen = set(existing)
+    for record in records:
+        key = tuple(record[column] for column in key_columns)
+        if key not in seen:
+            seen.add(key)
+            new.append(record)
+
+    return new
+
+
+async def _merge_records(session: AsyncSession, table: type, target_index: int, records: List[dict]) -> None:
+    """Merge records moved from another shard into the records stored on the session's shard
+
+    Args:
+        session: Database session for the target shard
+        table: The ORM table the records belong to
+        target_index: Index of the target shard
+        records: The records to merge
+    """
+
+    if table is orm.StatusRollup:
+        statement = pg_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[column.name for column in table.__table__.primary_key.columns],
+            set_={'sample_count': table.sample_count + statement.excluded.sample_count})
+
+        await session.execute(statement, records)
+        return
+
+    egon_ids = {record['egon_id'] for record in records}
+    if table is orm.StatusHistory:
+        key_columns = ('egon_id', 'timestamp', 'status')
+        timestamps = [record['timestamp'] for record in records]
+        await history.create_partitions(session, {history.as_utc(ts).date() for ts in timestamps}, target_index)
+        query = select(table.egon_id, table.timestamp, table.status).where(
+            table.egon_id.in_(egon_ids), table.timestamp.between(min(timestamps), max(timestamps)))
+
+    else:
+        # Block concurrent writes so a record cannot be created between the check below and the insert
+        key_columns = ('egon_id',)
+        await session.execute(text(f'LOCK TABLE {table.__tablename__} IN SHARE ROW EXCLUSIVE MODE'))
+        query = select(table.egon_id).where(table.egon_id.in_(egon_ids))
+
+    existing = {tuple(row) for row in await session.execute(query)}
+    records = _new_records(records, existing, key_columns)
+    if records:
+        await session.execute(insert(table), records)
+
+
+async def _move_records(
+    table: type,
+    source: Callable[[], AsyncSession],
+    target: Callable[[], AsyncSession],
+    target_index: int,
+    egon_ids: List[str]
+) -> int:
+    """Move all records with the given Egon IDs from one shard to another
+
+    Args:
+        table: The ORM table to move records from
+        source: Session factory for the shard currently storing the records
+        target: Session factory for the shard that should store the records
+        target_index: Index of the target shard
+        egon_ids: Egon IDs of the records to move
+
+    Returns:
+        The number of records moved
+    """
+
+    primary_key = tuple_(*table.__table__.primary_key.columns)
+    page = select(*table.__table__.primary_key.columns) \
+        .where(table.egon_id.in_(egon_ids)) \
+        .order_by(*table.__table__.primary_key.columns) \
+        .limit(BATCH_SIZE)
+
+    moved = 0
+    while True:
+        async with source() as source_session:
+            result = await source_session.execute(
+                delete(table).where(primary_key.in_(page)).returning(*_copied_columns(table)))
+
+            records = [dict(row) for row in result.mappings()]
+            if not records:
+                return moved
+
+            async with target() as target_session:
+                await _merge_records(target_session, table, target_index, records)
+                await target_session.commit()
+
+            await source_session.commit()
+
+        moved += len(records)
+
+
+async def rebalance(previous_urls: Sequence[str], urls: Sequence[str]) -> int:
+    """Move records to the shards that own them after shards are added
+
+    Args:
+        previous_urls: URL information for the shards in use before the new shards were added
+        urls: URL information for all shards, including the new shards
+
+    Returns:
+        The total number of records moved
+
+    Raises:
+        ValueError: If a previous shard is missing from the new list of shards
+    """
+
+    names = [orm.shard_name(url) for url in urls]
+    missing = {orm.shard_name(url) for url in previous_urls} - set(names)
+    if missing:
+        raise ValueError(f'Removing shards is not supported. Missing shards: {", ".join(sorted(missing))}')
+
+    ring = orm.HashRing(names)
+    engines = [create_async_engine(url) for url in urls]
+    session_makers = [sessionmaker(engine, class_=AsyncSession) for engine in engines]
+    sources = [names.index(orm.shard_name(url)) for url in previous_urls]
+
+    moved = 0
+    try:
+        for source in sources:
+            for table in SHARDED_TABLES:
+                async with session_makers[source]() as session:
+                    result = await session.execute(select(table.egon_id).distinct())
+                    egon_ids = result.scalars().all()
+
+                reassigned: Dict[int, List[str]] = defaultdict(list)
+                for egon_id in egon_ids:
+                    owner = ring.get_shard(egon_id)
+                    if owner != source:
+                        reassigned[owner].append(egon_id)
+
+                for target, target_ids in reassigned.items():
+                    for start in range(0, len(target_ids), BATCH_SIZE):
+                        moved += await _move_records(
+                            table,
+                            session_makers[source],
+                            session_makers[target],
+                            target,
+                            target_ids[start:start + BATCH_SIZE])
+
+    finally:
+        for engine in engines:
+            await engine.dispose()
+
+    return moved
@@ -0,0 +1,71 @@
+"""Precomputed summary statistics describing pipeline and node activity.
+
+The ``StatusSummary`` class holds a snapshot of aggregate counts for each
+table in memory. The snapshot is refreshed in the background by each server
+worker, so serving the summary never touches the database and takes
+constant time regardless of the number of registered pipelines or nodes.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from . import orm
+
+
+class StatusSummary:
+    """In-memory snapshot of pipeline and node activity counts"""
+
+    def __init__(self, recent_window: float, stale_after: float) -> None:
+        """Initialize an empty summary
+
+        Args:
+            recent_window: Objects updated within this many seconds are counted as recently updated
+            stale_after: Objects not updated within this many seconds are counted as stale
+        """
+
+        self.recent_window = recent_window
+        self.stale_after = stale_after
+        self.refreshed_at: Optional[datetime] = None
+        self._body = self._render({'refreshed_at': None, 'pipelines': None, 'nodes': None})
+
+    @staticmethod
+    def _render(content: dict) -> bytes:
+        """Serialize summary content into a JSON response body"""
+
+        return json.dumps(content, separators=(',', ':')).encode()
+
+    async def _count(self, table: type, now: datetime) -> dict:
+        """Return activity counts for the given table summed across all database shards"""
+
+        recent = now - timedelta(seconds=self.recent_window)
+        stale = now - timedelta(seconds=self.stale_after)
+        query = select(
+            func.count(),
+            func.count().filter(table.last_updated >= recent),
+            func.count().filter(table.last_updated < stale))
+
+        async def count_shard(session) -> tuple:
+            return tuple((await session.execute(query)).one())
+
+        counts = await orm.DBConnection.scatter(count_shard)
+        total, recently_updated, stale_count = (sum(column) for column in zip(*counts))
+        return {'total': total, 'recently_updated': recently_updated, 'stale': stale_count}
+
+    async def refresh(self) -> None:
+        """Recalculate the summary from the application database"""
+
+        now = datetime.now(timezone.utc)
+        pipelines, nodes = await asyncio.gather(self._count(orm.Pipeline, now), self._count(orm.Node, now))
+
+        self.refreshed_at = now
+        self._body = self._render({'refreshed_at': now.isoformat(), 'pipelines': pipelines, 'nodes': nodes})
+
+    @property
+    def body(self) -> bytes:
+        """The most recent summary as a JSON encoded response body"""
+
+        return self._body
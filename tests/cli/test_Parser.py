@@ -29,6 +29,37 @@ class MigrateSubparser(TestCase):
         self.assertEqual(Application.migrate_db, Parser().parse_args(['migrate']).callable)
 
 
+class RetentionSubparser(TestCase):
+    """Test the ``retention`` subparser"""
+
+    def test_callable_matches_application(self) -> None:
+        """Test the subparser is configured to call the correct ``Application`` method"""
+
+        self.assertEqual(Application.apply_retention, Parser().parse_args(['retention']).callable)
+
+
+class RebalanceSubparser(TestCase):
+    """Test the ``rebalance`` subparser"""
+
+    def test_callable_matches_application(self) -> None:
+        """Test the subparser is configured to call the correct ``Application`` method"""
+
+        args = Parser().parse_args(['rebalance', 'postgresql+asyncpg://localhost/egon'])
+        self.assertEqual(Application.rebalance_shards, args.callable)
+
+    def test_previous_shards_parsed(self) -> None:
+        """Test all previous shard URIs are included in the parsed arguments"""
+
+        uris = ['postgresql+asyncpg://host1/egon', 'postgresql+asyncpg://host2/egon']
+        self.assertEqual(uris, Parser().parse_args(['rebalance', *uris]).previous_shards)
+
+    def test_previous_shards_required(self) -> None:
+        """Test an error is raised when no previous shards are given"""
+
+        with self.assertRaises(SystemExit):
+            Parser().parse_args(['rebalance'])
+
+
 class ServeSubparser(TestCase):
     """Test the ``serve`` command"""
 
@@ -0,0 +1,218 @@
+"""Tests for the ``client.Client`` class."""
+
+import asyncio
+from typing import Union
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from egon_server.client import Client
+
+
+def mock_response(status_code: int = 200, json: Union[dict, list] = None) -> MagicMock:
+    """Return a mock ``requests.Response`` object"""
+
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = dict() if json is None else json
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(status_code)
+
+    return response
+
+
+class RetryDelay(TestCase):
+    """Test the calculation of jittered retry delays"""
+
+    def test_delay_within_backoff_limit(self) -> None:
+        """Test delays fall between zero and the exponential backoff limit"""
+
+        client = Client('http://localhost', backoff=0.5)
+        for attempt in range(5):
+            delay = client._retry_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 0.5 * 2 ** attempt)
+
+
+class Retries(IsolatedAsyncioTestCase):
+    """Test failed requests are retried"""
+
+    async def asyncSetUp(self) -> None:
+        """Create a client instance without retry delays"""
+
+        self.client = Client('http://localhost/v1', max_retries=2, backoff=0)
+
+    async def asyncTearDown(self) -> None:
+        """Close the client instance"""
+
+        await self.client.close()
+
+    async def test_retries_on_connection_error(self) -> None:
+        """Test requests are retried after a connection error"""
+
+        responses = [requests.ConnectionError(), mock_response(json={'egon_id': 'a'})]
+        with patch.object(self.client, '_send', side_effect=responses) as send:
+            result = await self.client.get_pipeline('a')
+
+        self.assertEqual({'egon_id': 'a'}, result)
+        self.assertEqual(2, send.call_count)
+
+    async def test_retries_on_unavailable(self) -> None:
+        """Test requests are retried after a retryable status code"""
+
+        responses = [mock_response(503), mock_response(json={'egon_id': 'a'})]
+        with patch.object(self.client, '_send', side_effect=responses) as send:
+            await self.client.get_node('a')
+
+        self.assertEqual(2, send.call_count)
+
+    async def test_no_retry_on_not_found(self) -> None:
+        """Test client errors are raised without retrying"""
+
+        with patch.object(self.client, '_send', return_value=mock_response(404)) as send:
+            with self.assertRaises(requests.HTTPError):
+                await self.client.get_pipeline('a')
+
+        send.assert_called_once()
+
+    async def test_error_raised_after_max_retries(self) -> None:
+        """Test the final error is raised once retries are exhausted"""
+
+        with patch.object(self.client, '_send', side_effect=requests.ConnectionError()) as send:
+            with self.assertRaises(requests.ConnectionError):
+                await self.client.get_pipeline('a')
+
+        self.assertEqual(3, send.call_count)
+
+
+class SingleLookups(IsolatedAsyncioTestCase):
+    """Test lookups made without batching"""
+
+    async def test_ids_encoded_in_path(self) -> None:
+        """Test reserved URL characters in Egon IDs are percent encoded"""
+
+        async with Client('http://localhost/v1') as client:
+            with patch.object(client, '_send', return_value=mock_response()) as send:
+                await client.get_pipeline('a b/?#%')
+                await client.get_node('a b/?#%')
+
+        self.assertEqual('/pipeline/a%20b%2F%3F%23%25', send.call_args_list[0].args[0])
+        self.assertEqual('/node/a%20b%2F%3F%23%25/', send.call_args_list[1].args[0])
+
+
+class Batching(IsolatedAsyncioTestCase):
+    """Test the batching of calls made within the batch window"""
+
+    async def asyncSetUp(self) -> None:
+        """Create a client instance with batching enabled"""
+
+        self.client = Client('http://localhost/v1', batch_window=0.01, backoff=0.01, batch_size=2)
+
+    async def asyncTearDown(self) -> None:
+        """Close the client instance"""
+
+        await self.client.close()
+
+    async def test_distinct_calls_combined(self) -> None:
+        """Test lookups for distinct objects of the same type share a single request"""
+
+        records = [{'egon_id': 'a'}, {'egon_id': 'b'}]
+        with patch.object(self.client, '_send', return_value=mock_response(json=records)) as send:
+            results = await asyncio.gather(self.client.get_pipeline('a'), self.client.get_pipeline('b'))
+
+        self.assertEqual(records, results)
+        send.assert_called_once_with('/pipelines', {'ids': ['a', 'b']})
+
+    async def test_one_request_per_object_type(self) -> None:
+        """Test pipeline and node lookups are sent to their respective batch endpoints"""
+
+        with patch.object(self.client, '_send', return_value=mock_response(json=[{'egon_id': 'a'}])) as send:
+            await asyncio.gather(self.client.get_pipeline('a'), self.client.get_node('a'))
+
+        paths = sorted(call.args[0] for call in send.call_args_list)
+        self.assertEqual(['/nodes', '/pipelines'], paths)
+
+    async def test_batches_split_by_size(self) -> None:
+        """Test batches larger than the batch size are split across several requests"""
+
+        with patch.object(self.client, '_send', return_value=mock_response(json=[])) as send:
+            await asyncio.gather(*(self.client.get_node(i) for i in 'abc'), return_exceptions=True)
+
+        self.assertEqual(2, send.call_count)
+
+    async def test_duplicate_calls_coalesced(self) -> None:
+        """Test repeated lookups within the batch window share a single result"""
+
+        with patch.object(self.client, '_send', return_value=mock_response(json=[{'egon_id': 'a'}])) as send:
+            results = await asyncio.gather(*(self.client.get_pipeline('a') for _ in range(5)))
+
+        self.assertEqual([{'egon_id': 'a'}] * 5, results)
+        send.assert_called_once_with('/pipelines', {'ids': ['a']})
+
+    async def test_missing_objects_raise_not_found(self) -> None:
+        """Test objects missing from the batch response raise an ``HTTPError`` with a 404 response"""
+
+        with patch.object(self.client, '_send', return_value=mock_response(json=[{'egon_id': 'a'}])):
+            found, missing = await asyncio.gather(
+                self.client.get_node('a'), self.client.get_node('b'), return_exceptions=True)
+
+        self.assertEqual({'egon_id': 'a'}, found)
+        self.assertIsInstance(missing, requests.HTTPError)
+        self.assertEqual(404, missing.response.status_code)
+
+    async def test_chunks_sent_concurrently(self) -> None:
+        """Test the requests for each chunk of a large batch are in flight at the same time"""
+
+        in_flight, max_in_flight = 0, 0
+
+        async def request(path: str, params: dict) -> list:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [{'egon_id': egon_id} for egon_id in params['ids']]
+
+        with patch.object(self.client, '_request', side_effect=request):
+            await asyncio.gather(*(self.client.get_node(i) for i in 'abcd'))
+
+        self.assertEqual(2, max_in_flight)
+
+    async def test_errors_propagated(self) -> None:
+        """Test request errors are raised for every caller in the batch"""
+
+        with patch.object(self.client, '_send', return_value=mock_response(404)):
+            results = await asyncio.gather(
+                self.client.get_node('a'), self.client.get_node('b'), return_exceptions=True)
+
+        for result in results:
+            self.assertIsInstance(result, requests.HTTPError)
+
+
+class Close(IsolatedAsyncioTestCase):
+    """Test closing the client"""
+
+    async def test_waits_for_in_flight_batches(self) -> None:
+        """Test batched calls already being dispatched (including retries) complete before closing"""
+
+        client = Client('http://localhost/v1', batch_window=0.01, backoff=0.05)
+        responses = [requests.ConnectionError(), mock_response(json=[{'egon_id': 'a'}])]
+        with patch.object(client, '_send', side_effect=responses) as send:
+            call = asyncio.create_task(client.get_pipeline('a'))
+            await asyncio.sleep(0.02)  # Let the batch window close so the request is in flight
+            await client.close()
+            result = await call
+
+        self.assertEqual({'egon_id': 'a'}, result)
+        self.assertEqual(2, send.call_count)
+
+    async def test_dispatches_pending_calls(self) -> None:
+        """Test calls collected in an open batch window are dispatched before closing"""
+
+        client = Client('http://localhost/v1', batch_window=0.01)
+        with patch.object(client, '_send', return_value=mock_response(json=[{'egon_id': 'a'}])):
+            call = asyncio.create_task(client.get_node('a'))
+            await asyncio.sleep(0)
+            await client.close()
+
+        self.assertEqual({'egon_id': 'a'}, await call)
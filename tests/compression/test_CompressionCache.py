@@ -0,0 +1,53 @@
+"""Tests for the ``compression.CompressionCache`` class."""
+
+from unittest import TestCase
+
+from egon_server.compression import CompressionCache
+
+
+class CacheEviction(TestCase):
+    """Test the eviction of cached bodies"""
+
+    def test_size_limit_respected(self) -> None:
+        """Test the combined size of cached bodies never exceeds the limit"""
+
+        cache = CompressionCache(max_size=25)
+        for i in range(5):
+            cache.put(cache.key('gzip', bytes([i])), b'x' * 10)
+
+        self.assertLessEqual(cache.size, 25)
+        self.assertEqual(2, len(cache))
+
+    def test_least_recently_used_evicted(self) -> None:
+        """Test the least recently accessed body is evicted first"""
+
+        cache = CompressionCache(max_size=20)
+        first, second, third = (cache.key('gzip', body) for body in (b'1', b'2', b'3'))
+        cache.put(first, b'x' * 10)
+        cache.put(second, b'y' * 10)
+        cache.get(first)
+        cache.put(third, b'z' * 10)
+
+        self.assertIsNotNone(cache.get(first))
+        self.assertIsNone(cache.get(second))
+
+    def test_oversized_body_not_cached(self) -> None:
+        """Test bodies larger than the cache are ignored"""
+
+        cache = CompressionCache(max_size=5)
+        cache.put(cache.key('gzip', b'1'), b'x' * 10)
+        self.assertEqual(0, len(cache))
+
+
+class CacheKey(TestCase):
+    """Test the generation of cache keys"""
+
+    def test_key_depends_on_encoding(self) -> None:
+        """Test the same body compressed with different encodings has different keys"""
+
+        self.assertNotEqual(CompressionCache.key('gzip', b'body'), CompressionCache.key('br', b'body'))
+
+    def test_key_depends_on_body(self) -> None:
+        """Test different bodies have different keys"""
+
+        self.assertNotEqual(CompressionCache.key('gzip', b'a'), CompressionCache.key('gzip', b'b'))
@@ -0,0 +1,220 @@
+"""Tests for the ``compression.CompressionMiddleware`` class."""
+
+import asyncio
+import gzip
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from egon_server.compression import CompressionMiddleware, GzipCodec, available_codecs, brotli, zstandard
+
+PAYLOAD = b'egon' * 1000
+PUBLIC = {'Cache-Control': 'public, max-age=60'}
+
+
+def create_client(**kwargs) -> TestClient:
+    """Return a test client for an application wrapped by the compression middleware"""
+
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **kwargs)
+
+    @app.get('/large')
+    def large() -> Response:
+        return Response(PAYLOAD)
+
+    @app.get('/small')
+    def small() -> Response:
+        return Response(b'egon')
+
+    @app.get('/cacheable')
+    @app.post('/cacheable')
+    def cacheable() -> Response:
+        return Response(PAYLOAD, headers=PUBLIC)
+
+    @app.get('/missing')
+    def missing() -> Response:
+        return Response(PAYLOAD, status_code=404, headers=PUBLIC)
+
+    @app.get('/cache-control')
+    def cache_control(value: str) -> Response:
+        return Response(PAYLOAD, headers={'Cache-Control': value})
+
+    @app.get('/stream')
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([PAYLOAD[:2000], PAYLOAD[2000:]]))
+
+    return TestClient(app)
+
+
+def patch_gzip():
+    """Patch gzip compression with a mock that tracks calls"""
+
+    return patch.object(GzipCodec, 'compress', autospec=True, side_effect=lambda self, data: gzip.compress(data))
+
+
+class Compression(TestCase):
+    """Test response bodies are compressed"""
+
+    def test_large_response_compressed(self) -> None:
+        """Test responses above the minimum size are compressed"""
+
+        response = create_client().get('/large', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(PAYLOAD, response.content)
+
+    def test_small_response_not_compressed(self) -> None:
+        """Test responses below the minimum size are sent uncompressed"""
+
+        response = create_client(minimum_size=500).get('/small', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_unsupported_encoding_not_compressed(self) -> None:
+        """Test responses are sent uncompressed when the client accepts no supported encoding"""
+
+        response = create_client().get('/large', headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(PAYLOAD, response.content)
+
+    def test_streaming_response_compressed(self) -> None:
+        """Test streaming responses are compressed without a content length"""
+
+        response = create_client().get('/stream', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertEqual(PAYLOAD, response.content)
+
+    def test_available_encodings_round_trip(self) -> None:
+        """Test every available encoding produces a body the client can decode"""
+
+        client = create_client()
+        for encoding in available_codecs():
+            response = client.get('/large', headers={'Accept-Encoding': encoding})
+            self.assertEqual(encoding, response.headers['Content-Encoding'])
+            self.assertEqual(PAYLOAD, response.content)
+
+
+class Caching(TestCase):
+    """Test compressed response bodies are cached"""
+
+    def test_cached_body_reused(self) -> None:
+        """Test identical response bodies are only compressed once"""
+
+        client = create_client(cache_size=1_000_000)
+        with patch_gzip() as compress:
+            for _ in range(3):
+                response = client.get('/cacheable', headers={'Accept-Encoding': 'gzip'})
+                self.assertEqual(PAYLOAD, response.content)
+
+        compress.assert_called_once()
+
+    def assert_not_cached(self, method: str, url: str) -> None:
+        """Assert responses to the given request are compressed on every request"""
+
+        client = create_client(cache_size=1_000_000)
+        with patch_gzip() as compress:
+            for _ in range(2):
+                response = client.request(method, url, headers={'Accept-Encoding': 'gzip'})
+                self.assertEqual(PAYLOAD, response.content)
+
+        self.assertEqual(2, compress.call_count)
+
+    def test_uncacheable_directives_not_cached(self) -> None:
+        """Test responses marked ``no-store``, ``no-cache``, or ``private`` are not cached"""
+
+        for value in ('no-store', 'public, no-cache', 'private, max-age=60'):
+            with self.subTest(value=value):
+                self.assert_not_cached('GET', f'/cache-control?value={value}')
+
+    def test_implicit_caching_not_cached(self) -> None:
+        """Test responses without an explicit ``public`` or ``max-age`` directive are not cached"""
+
+        self.assert_not_cached('GET', '/large')
+
+    def test_post_not_cached(self) -> None:
+        """Test responses to ``POST`` requests are not cached"""
+
+        self.assert_not_cached('POST', '/cacheable')
+
+    def test_error_not_cached(self) -> None:
+        """Test responses with a status other than ``200`` are not cached"""
+
+        self.assert_not_cached('GET', '/missing')
+
+    def test_cache_disabled(self) -> None:
+        """Test responses are compressed on every request when the cache is disabled"""
+
+        client = create_client(cache_size=0)
+        with patch_gzip() as compress:
+            for _ in range(2):
+                client.get('/cacheable', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(2, compress.call_count)
+
+
+class ConcurrentStreams(IsolatedAsyncioTestCase):
+    """Test streaming responses compressed concurrently by a single middleware instance"""
+
+    @staticmethod
+    def decompress(encoding: str, body: bytes) -> bytes:
+        """Decode a response body compressed with the given encoding"""
+
+        if encoding == 'br':
+            return brotli.decompress(body)
+
+        if encoding == 'zstd':
+            return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+        return gzip.decompress(body)
+
+    @staticmethod
+    async def request(middleware: CompressionMiddleware, path: str, encoding: str) -> bytes:
+        """Send a request through the middleware and return the raw response body"""
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+            'headers': [(b'accept-encoding', encoding.encode())]
+        }
+
+        body = bytearray()
+
+        async def receive() -> dict:
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message: dict) -> None:
+            body.extend(message.get('body', b''))
+
+        await middleware(scope, receive, send)
+        return bytes(body)
+
+    @staticmethod
+    async def app(scope: dict, receive, send) -> None:
+        """ASGI application streaming a payload specific to each path, yielding to the event loop between chunks"""
+
+        payload = scope['path'].encode() * 2000
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        if scope['path'] == '/full':
+            await send({'type': 'http.response.body', 'body': payload})
+            return
+
+        for start in range(0, len(payload), 1000):
+            await asyncio.sleep(0)
+            await send({'type': 'http.response.body', 'body': payload[start:start + 1000], 'more_body': True})
+
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def test_interleaved_streams(self) -> None:
+        """Test interleaved streams and complete bodies are each decoded correctly for every codec"""
+
+        for encoding in available_codecs():
+            with self.subTest(encoding=encoding):
+                middleware = CompressionMiddleware(self.app)
+                paths = ['/first', '/second', '/full']
+                bodies = await asyncio.gather(*(self.request(middleware, path, encoding) for path in paths))
+                for path, body in zip(paths, bodies):
+                    self.assertEqual(path.encode() * 2000, self.decompress(encoding, body))
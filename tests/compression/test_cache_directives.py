@@ -0,0 +1,24 @@
+"""Tests for the ``compression.cache_directives`` function."""
+
+from unittest import TestCase
+
+from egon_server.compression import cache_directives
+
+
+class CacheDirectives(TestCase):
+    """Test the parsing of ``Cache-Control`` header values"""
+
+    def test_arguments_removed(self) -> None:
+        """Test directive arguments are stripped from directive names"""
+
+        self.assertEqual({'public', 'max-age'}, cache_directives('public, max-age=60'))
+
+    def test_case_insensitive(self) -> None:
+        """Test directive names are lower-cased"""
+
+        self.assertEqual({'no-store', 'private'}, cache_directives('No-Store,PRIVATE'))
+
+    def test_empty_header(self) -> None:
+        """Test an empty header has no directives"""
+
+        self.assertEqual(set(), cache_directives(''))
@@ -0,0 +1,38 @@
+"""Tests for the ``compression.negotiate_encoding`` function."""
+
+from unittest import TestCase
+
+from egon_server.compression import negotiate_encoding
+
+SUPPORTED = ('br', 'zstd', 'gzip')
+
+
+class NegotiateEncoding(TestCase):
+    """Test the selection of a content encoding from the ``Accept-Encoding`` header"""
+
+    def test_server_preference_breaks_ties(self) -> None:
+        """Test the server's preferred encoding is chosen when quality values are equal"""
+
+        self.assertEqual('br', negotiate_encoding('gzip, deflate, br', SUPPORTED))
+
+    def test_client_quality_respected(self) -> None:
+        """Test encodings with higher quality values are preferred"""
+
+        self.assertEqual('gzip', negotiate_encoding('br;q=0.5, gzip;q=0.9', SUPPORTED))
+
+    def test_zero_quality_excluded(self) -> None:
+        """Test encodings with a quality of zero are never chosen"""
+
+        self.assertIsNone(negotiate_encoding('gzip;q=0', SUPPORTED))
+
+    def test_wildcard(self) -> None:
+        """Test the wildcard matches any supported encoding"""
+
+        self.assertEqual('br', negotiate_encoding('*', SUPPORTED))
+        self.assertEqual('zstd', negotiate_encoding('br;q=0, *', SUPPORTED))
+
+    def test_unsupported_encoding(self) -> None:
+        """Test ``None`` is returned when no supported encoding is acceptable"""
+
+        self.assertIsNone(negotiate_encoding('deflate', SUPPORTED))
+        self.assertIsNone(negotiate_encoding('', SUPPORTED))
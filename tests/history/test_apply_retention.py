@@ -0,0 +1,74 @@
+"""Tests for the ``history.apply_retention`` function."""
+
+from datetime import date, datetime, timezone
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from egon_server import history, orm
+
+NOW = datetime(2026, 10, 19, 15, 30, tzinfo=timezone.utc)
+EXPIRED_DAY = date(2026, 1, 2)
+CURRENT_DAY = NOW.date()
+LEFTOVER_DAY = date(2026, 1, 1)
+
+
+class ApplyRetention(IsolatedAsyncioTestCase):
+    """Test the order in which retention steps are applied to a shard"""
+
+    def setUp(self) -> None:
+        """Patch the database connection and individual retention steps"""
+
+        self.connection = MagicMock()
+        self.connection.execution_options = AsyncMock(return_value=self.connection)
+        self.connection.scalar = AsyncMock(return_value=True)
+        self.connection.execute = AsyncMock()
+
+        engine = MagicMock()
+        engine.connect.return_value.__aenter__.return_value = self.connection
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = MagicMock()
+
+        self.steps = MagicMock(detach=AsyncMock(), expire=AsyncMock(), downsample=AsyncMock())
+        patches = [
+            patch.object(orm.DBConnection, 'engines', [engine]),
+            patch.object(orm.DBConnection, 'session_makers', [session_maker]),
+            patch.object(history, 'list_partitions', AsyncMock(return_value=[EXPIRED_DAY, CURRENT_DAY])),
+            patch.object(history, 'list_detached_partitions', AsyncMock(return_value=[LEFTOVER_DAY])),
+            patch.object(history, '_detach_partition', self.steps.detach),
+            patch.object(history, '_expire_partition', self.steps.expire),
+            patch.object(history, '_downsample_rollups', self.steps.downsample),
+        ]
+
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_expired_partitions_detached_before_expiring(self) -> None:
+        """Test leftover detached partitions are expired and expired partitions are detached then expired"""
+
+        await history.apply_retention(NOW)
+
+        self.assertEqual([
+            call.expire(0, LEFTOVER_DAY),
+            call.detach(self.connection, EXPIRED_DAY),
+            call.expire(0, EXPIRED_DAY),
+            call.downsample(0, NOW)
+        ], self.steps.mock_calls)
+
+    async def test_busy_shard_skipped(self) -> None:
+        """Test no retention steps run when another run holds the shard's advisory lock"""
+
+        self.connection.scalar.return_value = False
+        await history.apply_retention(NOW)
+
+        self.assertEqual([], self.steps.mock_calls)
+        self.connection.execute.assert_not_called()
+
+    async def test_lock_released_on_error(self) -> None:
+        """Test the advisory lock is released when a retention step fails"""
+
+        self.steps.downsample.side_effect = RuntimeError
+        with self.assertRaises(RuntimeError):
+            await history.apply_retention(NOW)
+
+        self.connection.execute.assert_awaited_once()
@@ -0,0 +1,21 @@
+"""Tests for the ``history.partition_name`` and ``history.partition_day`` functions."""
+
+from datetime import date
+from unittest import TestCase
+
+from egon_server.history import partition_day, partition_name
+
+
+class PartitionName(TestCase):
+    """Test the mapping between days and partition names"""
+
+    def test_name_format(self) -> None:
+        """Test partition names are prefixed by the parent table name"""
+
+        self.assertEqual('status_history_20260102', partition_name(date(2026, 1, 2)))
+
+    def test_round_trip(self) -> None:
+        """Test partition names can be converted back into the original day"""
+
+        day = date(2026, 10, 19)
+        self.assertEqual(day, partition_day(partition_name(day)))
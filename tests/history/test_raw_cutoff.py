@@ -0,0 +1,31 @@
+"""Tests for the ``history.raw_cutoff`` function."""
+
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from egon_server.history import raw_cutoff
+from egon_server.settings import SETTINGS
+
+
+class RawCutoff(TestCase):
+    """Test the calculation of the raw sample retention cutoff"""
+
+    def test_cutoff_aligned_to_midnight(self) -> None:
+        """Test the cutoff falls on a day boundary in UTC"""
+
+        cutoff = raw_cutoff(datetime(2026, 10, 19, 15, 30, tzinfo=timezone.utc))
+        self.assertEqual((0, 0, 0), (cutoff.hour, cutoff.minute, cutoff.second))
+        self.assertEqual(timezone.utc, cutoff.tzinfo)
+
+    def test_cutoff_matches_settings(self) -> None:
+        """Test the cutoff is offset from the current day by the retention setting"""
+
+        now = datetime(2026, 10, 19, 15, 30, tzinfo=timezone.utc)
+        expected = datetime(2026, 10, 19, tzinfo=timezone.utc) - timedelta(days=SETTINGS.history_raw_retention)
+        self.assertEqual(expected, raw_cutoff(now))
+
+    def test_naive_timestamps_treated_as_utc(self) -> None:
+        """Test naive timestamps give the same cutoff as their UTC equivalent"""
+
+        aware = datetime(2026, 10, 19, 23, 30, tzinfo=timezone.utc)
+        self.assertEqual(raw_cutoff(aware), raw_cutoff(aware.replace(tzinfo=None)))
@@ -0,0 +1,38 @@
+"""Tests for the ``history.validate_timestamps`` function."""
+
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from egon_server.history import raw_cutoff, validate_timestamps
+from egon_server.settings import SETTINGS
+
+NOW = datetime(2026, 10, 19, 15, 30, tzinfo=timezone.utc)
+
+
+class ValidateTimestamps(TestCase):
+    """Test the range of sample timestamps accepted into raw history"""
+
+    def test_accepts_range_bounds(self) -> None:
+        """Test timestamps at the retention cutoff and the clock skew limit are accepted"""
+
+        skew = timedelta(seconds=SETTINGS.history_max_clock_skew)
+        validate_timestamps([raw_cutoff(NOW), NOW, NOW + skew], now=NOW)
+
+    def test_rejects_expired_timestamps(self) -> None:
+        """Test timestamps before the raw retention cutoff are rejected"""
+
+        with self.assertRaises(ValueError):
+            validate_timestamps([raw_cutoff(NOW) - timedelta(seconds=1)], now=NOW)
+
+    def test_rejects_future_timestamps(self) -> None:
+        """Test timestamps further ahead than the allowed clock skew are rejected"""
+
+        skew = timedelta(seconds=SETTINGS.history_max_clock_skew)
+        with self.assertRaises(ValueError):
+            validate_timestamps([NOW + skew + timedelta(seconds=1)], now=NOW)
+
+    def test_rejects_maximum_timestamp(self) -> None:
+        """Test the latest representable timestamp is rejected without overflowing"""
+
+        with self.assertRaises(ValueError):
+            validate_timestamps([datetime.max.replace(tzinfo=timezone.utc)], now=NOW)
@@ -0,0 +1,55 @@
+"""Tests for the ``jobs.PeriodicJob`` class."""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock
+
+from egon_server.jobs import PeriodicJob
+
+
+class Init(TestCase):
+    """Test the validation of job arguments"""
+
+    def test_non_positive_interval(self) -> None:
+        """Test a ``ValueError`` is raised for intervals that would run the job continuously"""
+
+        for interval in (0, -1):
+            with self.assertRaises(ValueError):
+                PeriodicJob(AsyncMock(), interval=interval)
+
+
+class Scheduling(IsolatedAsyncioTestCase):
+    """Test jobs are run on schedule"""
+
+    async def test_runs_repeatedly(self) -> None:
+        """Test the job function is called once per interval"""
+
+        func = AsyncMock()
+        job = PeriodicJob(func, interval=0.01)
+        await job.start()
+        await asyncio.sleep(0.055)
+        await job.stop()
+
+        self.assertGreaterEqual(func.await_count, 3)
+
+    async def test_run_immediately(self) -> None:
+        """Test the job runs at startup when ``run_immediately`` is set"""
+
+        func = AsyncMock()
+        job = PeriodicJob(func, interval=60, run_immediately=True)
+        await job.start()
+        await asyncio.sleep(0)
+        await job.stop()
+
+        func.assert_awaited_once()
+
+    async def test_errors_do_not_stop_job(self) -> None:
+        """Test the job keeps running after the job function raises an error"""
+
+        func = AsyncMock(side_effect=RuntimeError)
+        job = PeriodicJob(func, interval=0.01)
+        await job.start()
+        await asyncio.sleep(0.035)
+        await job.stop()
+
+        self.assertGreaterEqual(func.await_count, 2)
@@ -0,0 +1,56 @@
+"""Tests for the ``orm.HashRing`` class."""
+
+from collections import Counter
+from unittest import TestCase
+
+from egon_server.orm import HashRing
+
+
+class GetShard(TestCase):
+    """Test the assignment of keys to shards"""
+
+    def setUp(self) -> None:
+        """Define a set of keys to distribute"""
+
+        self.keys = [f'pipeline-{i}' for i in range(2000)]
+
+    def test_single_shard(self) -> None:
+        """Test all keys map to the only shard"""
+
+        ring = HashRing(['a'])
+        self.assertEqual({0}, {ring.get_shard(key) for key in self.keys})
+
+    def test_assignment_is_stable(self) -> None:
+        """Test rings built from the same shards assign keys identically"""
+
+        shards = ['a', 'b', 'c']
+        ring1, ring2 = HashRing(shards), HashRing(shards)
+        for key in self.keys:
+            self.assertEqual(ring1.get_shard(key), ring2.get_shard(key))
+
+    def test_keys_distributed(self) -> None:
+        """Test every shard receives a reasonable share of keys"""
+
+        ring = HashRing(['a', 'b', 'c', 'd'])
+        counts = Counter(ring.get_shard(key) for key in self.keys)
+
+        self.assertEqual({0, 1, 2, 3}, set(counts))
+        for count in counts.values():
+            self.assertGreater(count, len(self.keys) / 4 / 2)
+
+    def test_adding_shard_moves_keys_to_new_shard_only(self) -> None:
+        """Test keys reassigned after adding a shard all move to the new shard"""
+
+        old_ring = HashRing(['a', 'b', 'c'])
+        new_ring = HashRing(['a', 'b', 'c', 'd'])
+
+        for key in self.keys:
+            new_shard = new_ring.get_shard(key)
+            if new_shard != old_ring.get_shard(key):
+                self.assertEqual(3, new_shard)
+
+    def test_no_shards_error(self) -> None:
+        """Test a ``ValueError`` is raised when building a ring without shards"""
+
+        with self.assertRaises(ValueError):
+            HashRing([])
@@ -0,0 +1,61 @@
+"""Tests for the ``resources.v1.Autocomplete`` class."""
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+
+from egon_server.resources.v1 import Autocomplete
+from egon_server.search import SearchResult
+
+
+class QueryIndex(IsolatedAsyncioTestCase):
+    """Test the in-memory index used to serve autocomplete requests"""
+
+    def setUp(self) -> None:
+        """Create a resource outside the running event loop, as done at application import time"""
+
+        self.resource = Autocomplete()
+        self.entries = [SearchResult('pipeline', 'p1', 'Ingest')]
+
+    async def test_concurrent_cold_requests(self) -> None:
+        """Test concurrent requests against a cold index rebuild it once and return matches"""
+
+        with patch.object(self.resource, '_load_entries', AsyncMock(return_value=self.entries)) as load:
+            results = await asyncio.gather(*(self.resource._query_index('in', 10) for _ in range(5)))
+
+        load.assert_awaited_once()
+        self.assertEqual([self.entries] * 5, results)
+
+    async def test_expired_index_served_during_rebuild(self) -> None:
+        """Test requests against an expired index are answered from the old index while it rebuilds"""
+
+        self.resource._index.build(self.entries)
+        self.resource._index.built_at -= 3600
+        rebuilt = asyncio.Event()
+
+        async def load_entries() -> list:
+            await rebuilt.wait()
+            return [SearchResult('pipeline', 'p2', 'Index')]
+
+        with patch.object(self.resource, '_load_entries', side_effect=load_entries) as load:
+            self.assertEqual(self.entries, await self.resource._query_index('in', 10))
+            self.assertEqual(self.entries, await self.resource._query_index('in', 10))
+
+            rebuilt.set()
+            await self.resource._rebuild_task
+
+        load.assert_called_once()
+        self.assertEqual('Index', (await self.resource._query_index('in', 10))[0].name)
+
+    async def test_failed_rebuild_retried(self) -> None:
+        """Test a failed background rebuild keeps the old index and is retried by the next request"""
+
+        self.resource._index.build(self.entries)
+        self.resource._index.built_at -= 3600
+
+        with patch.object(self.resource, '_load_entries', AsyncMock(side_effect=RuntimeError)) as load:
+            for _ in range(2):
+                self.assertEqual(self.entries, await self.resource._query_index('in', 10))
+                await asyncio.wait([self.resource._rebuild_task])
+
+        self.assertEqual(2, load.await_count)
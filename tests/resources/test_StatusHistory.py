@@ -0,0 +1,53 @@
+"""Tests for the ``resources.v1.StatusHistory`` class."""
+
+from datetime import datetime, timezone
+from unittest import TestCase
+from unittest.mock import AsyncMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_restful import Api
+
+from egon_server.resources.v1 import StatusHistory
+
+
+class Post(TestCase):
+    """Test the submission of status samples"""
+
+    def setUp(self) -> None:
+        """Create a test client for an application serving the resource"""
+
+        app = FastAPI()
+        Api(app).add_resource(StatusHistory(), '/history')
+        self.client = TestClient(app)
+
+    def post_sample(self, timestamp: str):
+        """Submit a single sample with the given timestamp"""
+
+        sample = {'object_type': 'pipeline', 'egon_id': 'p1', 'status': 'running', 'timestamp': timestamp}
+        return self.client.post('/history', json=[sample])
+
+    @patch('egon_server.history.insert_samples', new_callable=AsyncMock)
+    def test_current_sample_inserted(self, insert_samples: AsyncMock) -> None:
+        """Test samples timestamped at the current time are recorded"""
+
+        response = self.post_sample(datetime.now(timezone.utc).isoformat())
+        self.assertEqual(201, response.status_code)
+        self.assertEqual({'inserted': 1}, response.json())
+        insert_samples.assert_awaited_once()
+
+    @patch('egon_server.history.insert_samples', new_callable=AsyncMock)
+    def test_future_sample_rejected(self, insert_samples: AsyncMock) -> None:
+        """Test samples far in the future are rejected before reaching the database"""
+
+        response = self.post_sample('9999-12-31T23:59:59+00:00')
+        self.assertEqual(422, response.status_code)
+        insert_samples.assert_not_awaited()
+
+    @patch('egon_server.history.insert_samples', new_callable=AsyncMock)
+    def test_expired_sample_rejected(self, insert_samples: AsyncMock) -> None:
+        """Test samples older than the raw retention period are rejected"""
+
+        response = self.post_sample('2000-01-01T00:00:00+00:00')
+        self.assertEqual(422, response.status_code)
+        insert_samples.assert_not_awaited()
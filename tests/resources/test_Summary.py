@@ -0,0 +1,41 @@
+"""Tests for the ``resources.v1.Summary`` class."""
+
+from unittest import TestCase
+from unittest.mock import PropertyMock, patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_restful import Api
+
+from egon_server.api import AppFactory
+from egon_server.summary import StatusSummary
+
+
+class Get(TestCase):
+    """Test the ``/v1/summary`` endpoint"""
+
+    def setUp(self) -> None:
+        """Create a test client for an application serving version 1 endpoints"""
+
+        app = FastAPI()
+        summary = StatusSummary(recent_window=300, stale_after=3600)
+        AppFactory.add_v1_endpoints(Api(app), endpoint_root='/v1', summary=summary)
+        self.client = TestClient(app)
+
+    def test_serves_summary_body(self) -> None:
+        """Test the endpoint returns the current summary body as JSON"""
+
+        body = b'{"refreshed_at":"2026-10-19T00:00:00+00:00","pipelines":{"total":1},"nodes":{"total":2}}'
+        with patch.object(StatusSummary, 'body', new_callable=PropertyMock, return_value=body):
+            response = self.client.get('/v1/summary')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/json', response.headers['content-type'])
+        self.assertIn('public', response.headers['cache-control'])
+        self.assertEqual(body, response.content)
+
+    def test_null_before_refresh(self) -> None:
+        """Test the endpoint reports null counts before the first refresh"""
+
+        response = self.client.get('/v1/summary')
+        self.assertEqual({'refreshed_at': None, 'pipelines': None, 'nodes': None}, response.json())
@@ -0,0 +1,75 @@
+"""Tests for the ``search.PrefixIndex`` class."""
+
+from unittest import TestCase
+
+from egon_server.search import PrefixIndex, SearchResult
+
+
+class Search(TestCase):
+    """Test the ``search`` method"""
+
+    def setUp(self) -> None:
+        """Create an index with a handful of entries"""
+
+        self.entries = [
+            SearchResult('pipeline', 'p1', 'Ingest'),
+            SearchResult('pipeline', 'p2', 'index builder'),
+            SearchResult('node', 'n1', 'Inbox'),
+            SearchResult('node', 'n2', 'Outbox'),
+        ]
+        self.index = PrefixIndex(self.entries)
+
+    def test_matches_prefix(self) -> None:
+        """Test only entries starting with the prefix are returned in alphabetical order"""
+
+        names = [result.name for result in self.index.search('in', limit=10)]
+        self.assertEqual(['Inbox', 'index builder', 'Ingest'], names)
+
+    def test_case_insensitive(self) -> None:
+        """Test prefix matching ignores case"""
+
+        self.assertEqual(self.index.search('OUT', limit=10), self.index.search('out', limit=10))
+
+    def test_results_capped(self) -> None:
+        """Test the number of results does not exceed the limit"""
+
+        self.assertEqual(2, len(self.index.search('in', limit=2)))
+
+    def test_no_match(self) -> None:
+        """Test an empty list is returned when no entries match"""
+
+        self.assertEqual([], self.index.search('zzz', limit=10))
+
+    def test_empty_prefix_matches_all(self) -> None:
+        """Test an empty prefix matches every entry"""
+
+        self.assertEqual(len(self.entries), len(self.index.search('', limit=10)))
+
+
+class Build(TestCase):
+    """Test the ``build`` method"""
+
+    def test_replaces_entries(self) -> None:
+        """Test rebuilding the index replaces existing entries"""
+
+        index = PrefixIndex([SearchResult('node', 'n1', 'old')])
+        index.build([SearchResult('node', 'n2', 'new')])
+
+        self.assertEqual([], index.search('old', limit=10))
+        self.assertEqual(1, len(index))
+
+    def test_unbuilt_index_is_expired(self) -> None:
+        """Test an index created without entries is treated as infinitely old"""
+
+        index = PrefixIndex()
+        self.assertEqual(float('inf'), index.age())
+        self.assertFalse(index.is_built)
+        self.assertTrue(PrefixIndex([]).is_built)
+
+    def test_resets_age(self) -> None:
+        """Test rebuilding the index resets its age"""
+
+        index = PrefixIndex()
+        index.built_at = 0
+        index.build([])
+        self.assertLess(index.age(), 1)
@@ -0,0 +1,24 @@
+"""Tests for the ``search.escape_like`` function."""
+
+from unittest import TestCase
+
+from egon_server.search import escape_like
+
+
+class EscapeLike(TestCase):
+    """Test the escaping of SQL ``LIKE`` wildcards"""
+
+    def test_wildcards_escaped(self) -> None:
+        """Test ``%`` and ``_`` characters are escaped"""
+
+        self.assertEqual(r'50\% \_done', escape_like('50% _done'))
+
+    def test_escape_character_escaped(self) -> None:
+        """Test the escape character itself is escaped"""
+
+        self.assertEqual(r'a\\b', escape_like(r'a\b'))
+
+    def test_plain_string_unchanged(self) -> None:
+        """Test strings without special characters are returned unchanged"""
+
+        self.assertEqual('pipeline', escape_like('pipeline'))
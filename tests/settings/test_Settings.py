@@ -5,6 +5,8 @@ import re
 from copy import deepcopy
 from unittest import TestCase
 
+from pydantic import ValidationError
+
 from egon_server.settings import Settings
 
 
@@ -35,6 +37,13 @@ class Config(TestCase):
         custom_port = Settings().server_port
         self.assertEqual(99, custom_port)
 
+    def test_summary_refresh_interval_positive(self) -> None:
+        """Test the summary refresh interval must be greater than zero"""
+
+        os.environ['EGON_SUMMARY_REFRESH_INTERVAL'] = '0'
+        with self.assertRaises(ValidationError):
+            Settings()
+
 
 class GetDbUri(TestCase):
     """Test the ``get_db_uri`` method"""
@@ -55,6 +64,22 @@ class GetDbUri(TestCase):
         self.assertEqual(settings.db_name, database)
 
 
+class GetDbUris(TestCase):
+    """Test the ``get_db_uris`` method"""
+
+    def test_defaults_to_single_database(self) -> None:
+        """Test the application database URI is returned when no shards are configured"""
+
+        settings = Settings(db_shards=[])
+        self.assertEqual([settings.get_db_uri()], settings.get_db_uris())
+
+    def test_returns_shards(self) -> None:
+        """Test shard URIs are returned when configured"""
+
+        shards = ['postgresql+asyncpg://host1/egon', 'postgresql+asyncpg://host2/egon']
+        self.assertEqual(shards, Settings(db_shards=shards).get_db_uris())
+
+
 class GetLoggingConfig(TestCase):
     """Test the ``get_logging_config`` method"""
 
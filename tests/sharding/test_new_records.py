@@ -0,0 +1,26 @@
+"""Tests for the ``sharding._new_records`` function."""
+
+from unittest import TestCase
+
+from egon_server.sharding import _new_records
+
+
+class NewRecords(TestCase):
+    """Test the filtering of moved records already stored on the target shard"""
+
+    def test_existing_records_skipped(self) -> None:
+        """Test records whose keys already exist on the target are removed"""
+
+        records = [{'egon_id': 'a', 'name': 'moved'}, {'egon_id': 'b', 'name': 'moved'}]
+        self.assertEqual([records[1]], _new_records(records, {('a',)}, ['egon_id']))
+
+    def test_duplicate_records_skipped(self) -> None:
+        """Test only the first of several records sharing a key is kept"""
+
+        records = [
+            {'egon_id': 'a', 'timestamp': 1, 'status': 'ok'},
+            {'egon_id': 'a', 'timestamp': 1, 'status': 'ok'},
+            {'egon_id': 'a', 'timestamp': 2, 'status': 'ok'},
+        ]
+
+        self.assertEqual([records[0], records[2]], _new_records(records, set(), ['egon_id', 'timestamp', 'status']))
@@ -0,0 +1,45 @@
+"""Tests for the ``summary.StatusSummary`` class."""
+
+import json
+from datetime import datetime, timezone
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, patch
+
+from egon_server import orm
+from egon_server.summary import StatusSummary
+
+
+class Body(TestCase):
+    """Test the response body served by the summary"""
+
+    def test_empty_before_refresh(self) -> None:
+        """Test counts and the freshness timestamp are null before the first refresh"""
+
+        summary = StatusSummary(recent_window=300, stale_after=3600)
+        content = json.loads(summary.body)
+
+        self.assertIsNone(summary.refreshed_at)
+        self.assertEqual({'refreshed_at': None, 'pipelines': None, 'nodes': None}, content)
+
+
+class Refresh(IsolatedAsyncioTestCase):
+    """Test the ``refresh`` method"""
+
+    async def test_counts_summed_across_shards(self) -> None:
+        """Test counts from each shard are summed and the freshness timestamp is updated"""
+
+        # Total, recently updated, and stale counts returned by each of two shards
+        shard_counts = [(3, 1, 1), (2, 0, 1)]
+        summary = StatusSummary(recent_window=300, stale_after=3600)
+
+        before = datetime.now(timezone.utc)
+        with patch.object(orm.DBConnection, 'scatter', AsyncMock(return_value=shard_counts)):
+            await summary.refresh()
+
+        expected_counts = {'total': 5, 'recently_updated': 1, 'stale': 2}
+        content = json.loads(summary.body)
+
+        self.assertLessEqual(before, summary.refreshed_at)
+        self.assertEqual(summary.refreshed_at.isoformat(), content['refreshed_at'])
+        self.assertEqual(expected_counts, content['pipelines'])
+        self.assertEqual(expected_counts, content['nodes'])